@@ -0,0 +1,40 @@
+"""Perft: count the leaf positions of the move tree to a fixed depth.
+
+Moves are Board.generate_moves(), so clones reaching the same cell count
+once. Passes are not plies: after each move the side to move is
+Board.next_player(). As in chess perft, only positions at the full depth
+count: a line whose game ends earlier adds nothing.
+
+KNOWN_COUNTS holds the expected counts for levels.txt. Depths 1-4 were
+checked against a separate grid-based implementation of the rules, and
+Level 1, the standard start, matches the published Ataxx perft figures
+through depth 5.
+"""
+from typing import Dict
+
+from game.board import Board
+
+# Level name -> node counts for depths 1, 2, ...
+KNOWN_COUNTS: Dict[str, tuple] = {
+    'Level 1': (16, 256, 6460, 155888, 4752668),
+    'Level 2': (14, 196, 4184, 86528, 2266352),
+    'Level 3': (16, 256, 5948, 133264, 3639856),
+    'Level 4': (12, 144, 2668, 47298, 1055544),
+}
+
+
+def perft(board: Board, player: int, depth: int) -> int:
+    """Leaf count below the position with `player` to move"""
+    if depth == 0:
+        return 1
+    if player == 0:
+        return 0  # The game ended before reaching the depth
+    moves = board.generate_moves(player)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for from_index, to_index in moves:
+        record = board.apply_move(from_index, to_index, player)
+        nodes += perft(board, board.next_player(player), depth - 1)
+        board.unmake_move(record)
+    return nodes
@@ -0,0 +1,193 @@
+"""Benchmark suite for the rules engine.
+
+Checks perft counts against KNOWN_COUNTS for every level in levels.txt,
+then times move generation, make/unmake, game-over detection and whole
+random games. Results are printed as JSON. With --baseline, each rate is
+compared to a stored run, and the command exits with status 1 if a rate
+falls more than --tolerance below it or a perft count is wrong.
+
+    python -m benchmarks.run                          # run and print
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+Baselines are machine-specific; save a new one when the hardware changes.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from itertools import islice
+from typing import Callable, List, Tuple
+
+from game.benchmarking import load_levels, print_report, random_playout
+from game.board import Board
+from game.game_state import GameState
+
+from .perft import KNOWN_COUNTS, perft
+
+DEFAULT_PERFT_DEPTH = 4
+DEFAULT_TOLERANCE = 0.2  # Allowed slowdown before a rate counts as a regression
+
+# Each micro-benchmark repeats until it has run this long, best of REPEATS
+MIN_TIME = 0.2
+REPEATS = 5
+
+# Sample positions per level, taken every few plies of seeded random games
+SAMPLE_GAMES = 4
+SAMPLE_EVERY = 4
+
+
+def _sample_positions(levels: List[dict], seed: int = 1) -> List[Tuple[Board, int]]:
+    """Positions from the opening to the late middle game, with the side to move"""
+    rng = random.Random(seed)
+    positions = []
+    for level in levels:
+        for _ in range(SAMPLE_GAMES):
+            positions.extend(islice(random_playout(level, rng), 0, None, SAMPLE_EVERY))
+    return positions
+
+
+def _measure(batch: Callable[[], int], min_time: float) -> dict:
+    """Best rate of REPEATS runs; batch() does some work and returns its operation count"""
+    best = None
+    for _ in range(REPEATS):
+        ops = 0
+        start = time.perf_counter()
+        while True:
+            ops += batch()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        rate = ops / elapsed
+        if best is None or rate > best['ops_per_second']:
+            best = {'ops_per_second': round(rate), 'ops': ops, 'seconds': round(elapsed, 4)}
+    return best
+
+
+def run_perft(levels: List[dict], depth: int) -> List[dict]:
+    results = []
+    for level in levels:
+        board = Board()
+        board.load_from_json(level)
+        known = KNOWN_COUNTS.get(level['name'], ())
+        for d in range(1, depth + 1):
+            start = time.perf_counter()
+            nodes = perft(board, 1, d)
+            elapsed = time.perf_counter() - start
+            expected = known[d - 1] if d <= len(known) else None
+            results.append({'level': level['name'], 'depth': d, 'nodes': nodes, 'expected': expected,
+                            'ok': expected is None or nodes == expected, 'seconds': round(elapsed, 4),
+                            'nodes_per_second': round(nodes / elapsed) if elapsed else None})
+    return results
+
+
+def run_micro(levels: List[dict], min_time: float, seed: int = 1) -> dict:
+    positions = _sample_positions(levels, seed)
+    # Moves to make and unmake: the first legal move of each position
+    made = [(board, player, board.generate_moves(player)[0]) for board, player in positions]
+    pieces = [(board, pos) for board, player in positions
+              for pos in board.mask_to_cells(board.layout.full) if board.get_piece(pos) == player]
+    games = []
+    for board, player in positions:
+        game_state = GameState()
+        game_state.board = board
+        game_state.current_player = player
+        games.append(game_state)
+
+    def get_valid_moves():
+        for board, pos in pieces:
+            board.get_valid_moves(pos)
+        return len(pieces)
+
+    def generate_moves():
+        for board, player in positions:
+            board.generate_moves(player)
+        return len(positions)
+
+    def make_unmake():
+        for board, player, (from_index, to_index) in made:
+            board.unmake_move(board.apply_move(from_index, to_index, player))
+        return len(made)
+
+    def has_valid_moves():
+        for board, _ in positions:
+            board.has_valid_moves(1)
+            board.has_valid_moves(2)
+        return 2 * len(positions)
+
+    def game_over():
+        for game_state in games:
+            game_state.check_game_over()
+        return len(games)
+
+    rng = random.Random(seed)
+
+    def random_games():
+        for level in levels:
+            board = Board()
+            board.load_from_json(level)
+            player = 1
+            while player:
+                board.apply_move(*rng.choice(board.generate_moves(player)), player)
+                player = board.next_player(player)
+        return len(levels)
+
+    benchmarks = {'get_valid_moves': get_valid_moves, 'generate_moves': generate_moves,
+                  'make_unmake': make_unmake, 'has_valid_moves': has_valid_moves,
+                  'game_over': game_over, 'random_games': random_games}
+    return {name: _measure(batch, min_time) for name, batch in benchmarks.items()}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> dict:
+    """Rate ratios against a baseline run, flagging drops beyond tolerance"""
+    rates = {f'micro.{name}': result['ops_per_second'] for name, result in current['micro'].items()}
+    # Shallow perft runs take microseconds, too noisy to compare
+    deepest = max((r['depth'] for r in current['perft']), default=0)
+    rates.update((f"perft.{r['level']}.{r['depth']}", r['nodes_per_second'])
+                 for r in current['perft'] if r['depth'] == deepest)
+    old_rates = {f'micro.{name}': result['ops_per_second'] for name, result in baseline.get('micro', {}).items()}
+    old_rates.update((f"perft.{r['level']}.{r['depth']}", r['nodes_per_second'])
+                     for r in baseline.get('perft', []))
+    comparison = {}
+    for name, rate in rates.items():
+        old = old_rates.get(name)
+        if not old or not rate:
+            continue
+        ratio = rate / old
+        comparison[name] = {'baseline': old, 'current': rate, 'ratio': round(ratio, 3),
+                            'regression': ratio < 1 - tolerance}
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the rules-engine benchmark suite')
+    parser.add_argument('--levels', default='levels.txt')
+    parser.add_argument('--perft-depth', type=int, default=DEFAULT_PERFT_DEPTH)
+    parser.add_argument('--min-time', type=float, default=MIN_TIME, help='seconds per micro-benchmark run')
+    parser.add_argument('--baseline', help='compare against this saved run')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--save', help='also write the results to this file')
+    args = parser.parse_args()
+
+    levels = load_levels(args.levels)
+    report = {'python': platform.python_version(), 'machine': platform.machine(),
+              'timestamp': round(time.time()),
+              'perft': run_perft(levels, args.perft_depth),
+              'micro': run_micro(levels, args.min_time)}
+    failed = not all(result['ok'] for result in report['perft'])
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            report['comparison'] = compare(report, json.load(f), args.tolerance)
+        failed = failed or any(entry['regression'] for entry in report['comparison'].values())
+    report['failed'] = failed
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    print_report(report)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""Vectorised Ataxx engine that advances many boards of one level at once.
+
+Boards are stored as an ``(N, H, W)`` int8 array (0 empty, 1 and 2 for the
+players) indexed ``[n, x, y]`` like ``Board.board[x][y]``, and the level's
+blocker cells are one shared ``(H, W)`` boolean mask. Move generation,
+capture counts and move application are array operations over shifted
+views: the only Python loops run over the 8 clone or 24 move offsets,
+never over boards. Rules follow game/board.py and GameState exactly: jumps
+vacate their origin, blockers are never targets, every opponent piece next
+to the destination converts, a player without moves is skipped, and the
+game ends when a side has no pieces or neither side can move.
+
+Requires NumPy.
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .board import Board
+
+# Offsets from origin to destination: the 8 clone moves, then the 16 jumps
+CLONE_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)]
+JUMP_OFFSETS = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if max(abs(dx), abs(dy)) == 2]
+MOVE_OFFSETS = CLONE_OFFSETS + JUMP_OFFSETS
+_CLONE_DX = np.array([dx for dx, _ in CLONE_OFFSETS])
+_CLONE_DY = np.array([dy for _, dy in CLONE_OFFSETS])
+_JUMP_DX = np.array([dx for dx, _ in JUMP_OFFSETS])
+_JUMP_DY = np.array([dy for _, dy in JUMP_OFFSETS])
+
+PAD = 2
+
+
+def _shifted(padded: np.ndarray, dx: int, dy: int, height: int, width: int) -> np.ndarray:
+    """View of a PAD-padded array where out[..., x, y] = original[..., x + dx, y + dy]"""
+    return padded[..., PAD + dx:PAD + dx + height, PAD + dy:PAD + dy + width]
+
+
+def _pad(a: np.ndarray) -> np.ndarray:
+    """Copy of a (N, H, W) array with PAD zero cells around each board"""
+    padded = np.zeros((a.shape[0], a.shape[1] + 2 * PAD, a.shape[2] + 2 * PAD), dtype=a.dtype)
+    padded[:, PAD:-PAD, PAD:-PAD] = a
+    return padded
+
+
+def _dilate2(mask: np.ndarray) -> np.ndarray:
+    """Grow a (N, H, W) mask by two cells in every direction, one axis at a time"""
+    rows = mask.copy()
+    for d in (1, 2):
+        rows[:, d:] |= mask[:, :-d]
+        rows[:, :-d] |= mask[:, d:]
+    out = rows.copy()
+    for d in (1, 2):
+        out[:, :, d:] |= rows[:, :, :-d]
+        out[:, :, :-d] |= rows[:, :, d:]
+    return out
+
+
+class BatchBoards:
+    """N games on the same level, advanced together with array operations"""
+
+    def __init__(self, level_data: dict, count: int, seed=None):
+        grid = np.array(level_data['board'], dtype=np.int8)
+        blockers = grid == 9
+        start = np.where(blockers, 0, grid).astype(np.int8)
+        self._setup(np.repeat(start[None], count, axis=0), blockers, np.ones(count, dtype=np.int8), seed)
+
+    @classmethod
+    def from_boards(cls, boards: Sequence[Board], players: Sequence[int], seed=None) -> 'BatchBoards':
+        """Batch positions of one level taken from Board objects, with their sides to move
+
+        seed may be an int or an existing numpy Generator to share.
+        """
+        grids = np.array([board.board for board in boards], dtype=np.int8)
+        blockers = grids[0] == 9
+        batch = cls.__new__(cls)
+        batch._setup(np.where(blockers, 0, grids).astype(np.int8), blockers,
+                     np.array(players, dtype=np.int8), seed)
+        return batch
+
+    def _setup(self, boards: np.ndarray, blockers: np.ndarray, to_move: np.ndarray, seed):
+        self.boards = boards
+        self.height, self.width = blockers.shape
+        self.blockers = blockers
+        self.to_move = to_move
+        count = boards.shape[0]
+        self.done = np.zeros(count, dtype=bool)
+        self.winner = np.full(count, -1, dtype=np.int8)  # -1 while running, 0 for a draw
+        self.moves_played = np.zeros(count, dtype=np.int32)
+        self.rng = np.random.default_rng(seed)
+        self._check_game_over()
+
+    @property
+    def count(self) -> int:
+        return self.boards.shape[0]
+
+    def piece_counts(self) -> np.ndarray:
+        """(N, 2) array of player 1 and player 2 piece counts"""
+        return np.stack([(self.boards == 1).sum(axis=(1, 2)), (self.boards == 2).sum(axis=(1, 2))], axis=1)
+
+    def empty(self) -> np.ndarray:
+        """(N, H, W) mask of empty, traversable cells"""
+        return (self.boards == 0) & ~self.blockers
+
+    def neighbour_counts(self, player: np.ndarray) -> np.ndarray:
+        """(N, H, W) count of `player` pieces adjacent to each cell (a 3x3 convolution)
+
+        player is a scalar or an (N,) array with one player per board.
+        """
+        pieces = _pad(self.boards == np.asarray(player).reshape(-1, 1, 1))
+        total = np.zeros(self.boards.shape, dtype=np.int8)
+        for dx, dy in CLONE_OFFSETS:
+            total += _shifted(pieces, dx, dy, self.height, self.width)
+        return total
+
+    def legal_moves(self, player: np.ndarray) -> np.ndarray:
+        """(N, 24, H, W) mask: [n, k, x, y] is a legal move to (x, y) along MOVE_OFFSETS[k]
+
+        The origin of that move is (x - dx_k, y - dy_k).
+        """
+        own = _pad(self.boards == np.asarray(player).reshape(-1, 1, 1))
+        empty = self.empty()
+        legal = np.empty((self.count, len(MOVE_OFFSETS), self.height, self.width), dtype=bool)
+        for k, (dx, dy) in enumerate(MOVE_OFFSETS):
+            np.logical_and(empty, _shifted(own, -dx, -dy, self.height, self.width), out=legal[:, k])
+        return legal
+
+    def capture_counts(self, player: np.ndarray) -> np.ndarray:
+        """(N, H, W) number of pieces a move by player to each cell would convert"""
+        return self.neighbour_counts(3 - np.asarray(player))
+
+    def has_moves(self, player: np.ndarray) -> np.ndarray:
+        """(N,) whether player has any legal move on each board"""
+        # A player can move iff an empty cell lies within two steps of one of its pieces
+        near_empty = _dilate2(self.empty())
+        return (near_empty & (self.boards == np.asarray(player).reshape(-1, 1, 1))).any(axis=(1, 2))
+
+    def mobility(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(N,) has-moves arrays for player 1 and player 2, sharing one dilation"""
+        near_empty = _dilate2(self.empty())
+        return ((near_empty & (self.boards == 1)).any(axis=(1, 2)),
+                (near_empty & (self.boards == 2)).any(axis=(1, 2)))
+
+    def apply_moves(self, from_x: np.ndarray, from_y: np.ndarray, to_x: np.ndarray, to_y: np.ndarray,
+                    active: Optional[np.ndarray] = None) -> np.ndarray:
+        """Play one move on every active board for its side to move
+
+        Coordinates are (N,) arrays; boards where active is False are left
+        untouched. Returns the (N,) number of converted pieces. Moves are
+        assumed legal, as with Board.make_move.
+        """
+        n = np.arange(self.count)
+        if active is None:
+            active = ~self.done
+        idx = n[active]
+        player = self.to_move[idx]
+        fx, fy, tx, ty = from_x[idx], from_y[idx], to_x[idx], to_y[idx]
+
+        is_jump = np.maximum(np.abs(tx - fx), np.abs(ty - fy)) > 1
+        self.boards[idx[is_jump], fx[is_jump], fy[is_jump]] = 0
+        self.boards[idx, tx, ty] = player
+
+        # All 8 neighbours of every destination in one (moves, 8) gather
+        nx = tx[:, None] + _CLONE_DX
+        ny = ty[:, None] + _CLONE_DY
+        inside = (nx >= 0) & (nx < self.height) & (ny >= 0) & (ny < self.width)
+        rows = np.broadcast_to(idx[:, None], nx.shape)[inside]
+        owner = np.broadcast_to(player[:, None], nx.shape)[inside]
+        nx, ny = nx[inside], ny[inside]
+        flip = self.boards[rows, nx, ny] == 3 - owner
+        self.boards[rows[flip], nx[flip], ny[flip]] = owner[flip]
+        converted = np.bincount(rows[flip], minlength=self.count)
+
+        self.moves_played[idx] += 1
+        self._advance_turn(idx)
+        return converted
+
+    def _advance_turn(self, idx: np.ndarray):
+        """Check game over, then pass the turn unless the opponent cannot move"""
+        p1_moves, p2_moves = self._check_game_over()
+        running = idx[~self.done[idx]]
+        opponent = 3 - self.to_move[running]
+        can_move = np.where(opponent == 1, p1_moves[running], p2_moves[running])
+        self.to_move[running[can_move]] = opponent[can_move]
+
+    def _check_game_over(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Mark finished games and their winners, as in GameState.check_game_over
+
+        Returns the per-board move availability of both players.
+        """
+        counts = self.piece_counts()
+        p1, p2 = counts[:, 0], counts[:, 1]
+        p1_moves, p2_moves = self.mobility()
+        over = ~self.done & ((p1 == 0) | (p2 == 0) | (~p1_moves & ~p2_moves))
+        self.winner[over] = np.where(p1[over] > p2[over], 1, np.where(p2[over] > p1[over], 2, 0))
+        self.done |= over
+        return p1_moves, p2_moves
+
+    def _move_planes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct moves for the side to move, as Board.generate_moves lists them
+
+        Returns a (N, 17, H, W) mask whose plane 0 marks clone destinations
+        (one move each, whatever the origin) and planes 1-16 jumps along
+        JUMP_OFFSETS, plus the padded own-piece mask to resolve origins.
+        """
+        own = _pad(self.boards == self.to_move.reshape(-1, 1, 1))
+        empty = self.empty()
+        planes = np.empty((self.count, 1 + len(JUMP_OFFSETS), self.height, self.width), dtype=bool)
+        clone_reach = np.zeros(self.boards.shape, dtype=bool)
+        for dx, dy in CLONE_OFFSETS:
+            clone_reach |= _shifted(own, -dx, -dy, self.height, self.width)
+        np.logical_and(empty, clone_reach, out=planes[:, 0])
+        for k, (dx, dy) in enumerate(JUMP_OFFSETS, 1):
+            np.logical_and(empty, _shifted(own, -dx, -dy, self.height, self.width), out=planes[:, k])
+        return planes, own
+
+    def _pick(self, scores: np.ndarray, own: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Turn _move_planes-shaped scores (highest wins) into move coordinate arrays"""
+        flat = scores.reshape(self.count, -1).argmax(axis=1)
+        k, rest = np.divmod(flat, self.height * self.width)
+        to_x, to_y = np.divmod(rest, self.width)
+        jump = np.maximum(k - 1, 0)
+        from_x, from_y = to_x - _JUMP_DX[jump], to_y - _JUMP_DY[jump]
+        # Clones may come from any adjacent own piece; take the first
+        n = np.arange(self.count)
+        origins = own[n[:, None], to_x[:, None] + PAD - _CLONE_DX, to_y[:, None] + PAD - _CLONE_DY]
+        first = origins.argmax(axis=1)
+        clone = k == 0
+        from_x[clone] = (to_x - _CLONE_DX[first])[clone]
+        from_y[clone] = (to_y - _CLONE_DY[first])[clone]
+        return from_x, from_y, to_x, to_y
+
+    def random_moves(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """A uniformly random legal (from, to) move per board for its side to move"""
+        planes, own = self._move_planes()
+        # Legal moves score in [1, 2) and illegal ones in [0, 1), so argmax is uniform over legal
+        scores = self.rng.random(planes.shape, dtype=np.float32)
+        scores += planes
+        return self._pick(scores, own)
+
+    def greedy_moves(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """The legal move with the largest piece swing per board, ties broken randomly"""
+        planes, own = self._move_planes()
+        # Legal moves score 2 * captures + 1 (+ 1 more for clones) plus a tie-break below 1
+        gain = 2 * self.capture_counts(self.to_move)[:, None] + 1
+        scores = self.rng.random(planes.shape, dtype=np.float32)
+        scores *= 0.5
+        scores += np.where(planes, gain, 0)
+        scores[:, 0] += planes[:, 0]
+        return self._pick(scores, own)
+
+    def play_out(self, policy: str = 'random', max_moves: int = 1000) -> np.ndarray:
+        """Advance every game to the end with a 'random' or 'greedy' policy; returns winners"""
+        choose = self.greedy_moves if policy == 'greedy' else self.random_moves
+        for _ in range(max_moves):
+            if self.done.all():
+                break
+            self.apply_moves(*choose())
+        return self.winner
@@ -0,0 +1,30 @@
+"""Helpers for the benchmark commands: level loading, random positions and reports."""
+import json
+import random
+from typing import Iterator, List, Tuple
+
+from .board import Board
+from .level_repository import LevelRepository
+
+
+def load_levels(path: str) -> List[dict]:
+    """Every level of a JSON level file or level pack"""
+    return list(LevelRepository(path))
+
+
+def random_playout(level: dict, rng: random.Random) -> Iterator[Tuple[Board, int]]:
+    """Yield a copy of each position of a uniformly random game with the side to move
+
+    Positions where the game has ended are not yielded.
+    """
+    board = Board()
+    board.load_from_json(level)
+    player = 1
+    while player:
+        yield board.copy(), player
+        board.apply_move(*rng.choice(board.generate_moves(player)), player)
+        player = board.next_player(player)
+
+
+def print_report(report: dict):
+    print(json.dumps(report, indent=2))
@@ -1,87 +1,586 @@
-from typing import List, Tuple, Optional
-import json
+from functools import lru_cache
+import copy
+from typing import List, Tuple
+import os
 
-class Board:
-    def __init__(self, size: Tuple[int, int] = (7, 7)):
+from .zobrist import SIDE_KEY, layout_key, piece_keys
+
+# Cell values used by level files and the board.board compatibility view
+EMPTY = 0
+BLOCKER = 9
+
+# (from_index, to_index, is_jump, converted_mask) as returned by Board.apply_move
+UndoRecord = Tuple[int, int, bool, int]
+
+# Set ATAXX_DEBUG=1 to verify incrementally maintained state against full scans
+DEBUG = os.environ.get('ATAXX_DEBUG', '') not in ('', '0')
+
+
+def _dilate_mask(mask: int, cols: int, not_first_col: int, not_last_col: int, full: int) -> int:
+    """Grow a mask by one cell in all eight directions"""
+    row = mask | ((mask << 1) & not_first_col) | ((mask >> 1) & not_last_col)
+    return (row | (row << cols) | (row >> cols)) & full
+
+
+class BoardLayout:
+    """Static geometry and neighbour index for one level layout.
+
+    Built once per (size, blocker mask) and shared by every Board loaded from
+    that layout. For each cell it stores the legal clone and jump targets,
+    both as bitmasks and as lookup tables of targets and moves, with
+    off-board and blocker cells already removed. Blocker cells get empty
+    entries.
+    """
+
+    def __init__(self, size: Tuple[int, int], blockers: int):
         self.size = size
-        self.board = [[0 for _ in range(size[1])] for _ in range(size[0])]
+        rows, cols = size
+        self.cols = cols
+        self.cells = rows * cols
+        self.full = (1 << self.cells) - 1
+        self.blockers = blockers
+        self.open_cells = self.cells - blockers.bit_count()  # Cells a piece can ever occupy
+
+        # Column masks used to stop horizontal shifts wrapping between rows
+        first_col = 0
+        last_col = 0
+        for x in range(rows):
+            first_col |= 1 << (x * cols)
+            last_col |= 1 << (x * cols + cols - 1)
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~last_col
+        self.not_first_two_cols = self.not_first_col & ~(first_col << 1)
+        self.not_last_two_cols = self.not_last_col & ~(last_col >> 1)
+
+        self.coords = tuple((i // cols, i % cols) for i in range(self.cells))
+
+        clone_masks = []
+        jump_masks = []
+        reach_shifts = []
+        local_targets = []
+        local_moves = []
+        # Walk each cell's 5x5 neighbourhood directly; dilating whole-board
+        # masks per cell costs O(cells^2) bit work on large boards
+        for i, (x, y) in enumerate(self.coords):
+            clone = jump = 0
+            cells = []
+            if not blockers >> i & 1:
+                for nx in range(max(0, x - 2), min(rows, x + 3)):
+                    for ny in range(max(0, y - 2), min(cols, y + 3)):
+                        j = nx * cols + ny
+                        if j == i or blockers >> j & 1:
+                            continue
+                        if abs(nx - x) <= 1 and abs(ny - y) <= 1:
+                            clone |= 1 << j
+                        else:
+                            jump |= 1 << j
+                        cells.append(j)
+            shift = cells[0] if cells else 0
+            clone_masks.append(clone)
+            jump_masks.append(jump)
+            reach_shifts.append(shift)
+            local_targets.append({j - shift: self.coords[j] for j in cells})
+            local_moves.append({j - shift: (self.coords[i], self.coords[j]) for j in cells})
+        self.clone_masks = tuple(clone_masks)
+        self.jump_masks = tuple(jump_masks)
+        self.reach_masks = tuple(c | j for c, j in zip(clone_masks, jump_masks))
+        # Shifting a board mask right by reach_shifts[i] brings the cells in
+        # reach of i down to small bit positions. local_clones[i],
+        # local_jumps[i] and local_reach[i] select them there, and
+        # local_targets[i] and local_moves[i] map each position to its (x, y)
+        # target and its prebuilt (from_pos, to_pos) move
+        self.reach_shifts = tuple(reach_shifts)
+        self.local_clones = tuple(mask >> shift for mask, shift in zip(clone_masks, reach_shifts))
+        self.local_jumps = tuple(mask >> shift for mask, shift in zip(jump_masks, reach_shifts))
+        self.local_reach = tuple(clone | jump for clone, jump in zip(self.local_clones, self.local_jumps))
+        self.local_targets = tuple(local_targets)
+        self.local_moves = tuple(local_moves)
+
+        # Zobrist keys: index by player, then cell; flip keys swap an owner
+        keys_1, keys_2 = piece_keys(self.cells)
+        self.piece_keys = (None, keys_1, keys_2)
+        self.flip_keys = tuple(a ^ b for a, b in zip(keys_1, keys_2))
+        self.base_key = layout_key(size, blockers)
+
+
+@lru_cache(maxsize=64)
+def get_layout(size: Tuple[int, int], blockers: int) -> BoardLayout:
+    """Return the cached layout index for a board size and blocker mask"""
+    return BoardLayout(size, blockers)
+
+
+class Board:
+    """Ataxx board backed by bitboards.
+
+    Cell (x, y) maps to bit ``x * width + y``. Each player owns one integer
+    mask, blockers and empty cells have their own masks, and the per-cell
+    clone and jump neighbours come from a shared, cached BoardLayout.
+    ``hash`` is a 64-bit Zobrist key of the placement, updated incrementally.
+    """
+
+    def __init__(self, size: Tuple[int, int] = (7, 7), debug: bool = DEBUG):
         self.selected_piece = None
+        self.debug = debug
+        self._load_grid(tuple(size), [[EMPTY for _ in range(size[1])] for _ in range(size[0])])
 
     def load_from_json(self, board_data: dict):
         """Load board configuration from JSON data"""
-        self.board = board_data['board']
-        self.size = tuple(board_data['size'])
+        self._load_grid(tuple(board_data['size']), board_data['board'])
+
+    def _load_grid(self, size: Tuple[int, int], grid: List[List[int]]):
+        """Build the piece masks from a list-of-lists grid and bind the layout index"""
+        rows, cols = size
+        pieces = [0, 0, 0]  # Index 0 unused so players index directly
+        blockers = 0
+        for x in range(rows):
+            for y in range(cols):
+                value = grid[x][y]
+                bit = 1 << (x * cols + y)
+                if value == BLOCKER:
+                    blockers |= bit
+                elif value in (1, 2):
+                    pieces[value] |= bit
+        self._load_masks(size, blockers, pieces[1], pieces[2])
+
+    def _load_masks(self, size: Tuple[int, int], blockers: int, player1: int, player2: int):
+        """Set the position from masks and bind the layout index"""
+        cols = size[1]
+        pieces = [0, player1, player2]  # Index 0 unused so players index directly
+        layout = get_layout(size, blockers)
+        self.layout = layout
+        self.size = size
+        self._cols = cols
+        self._cells = layout.cells
+        self._open_cells = layout.open_cells
+        self._full = layout.full
+        self._not_first_col = layout.not_first_col
+        self._not_last_col = layout.not_last_col
+        self._not_first_two_cols = layout.not_first_two_cols
+        self._not_last_two_cols = layout.not_last_two_cols
+        self._coords = layout.coords
+        self._clone_masks = layout.clone_masks
+        self._jump_masks = layout.jump_masks
+        self._reach_masks = layout.reach_masks
+        self._reach_shifts = layout.reach_shifts
+        self._local_clones = layout.local_clones
+        self._local_jumps = layout.local_jumps
+        self._local_reach = layout.local_reach
+        self._local_targets = layout.local_targets
+        self._local_moves = layout.local_moves
+        self._piece_keys = layout.piece_keys
+        self._flip_keys = layout.flip_keys
+
+        self._blockers = blockers
+        self._pieces = pieces
+        self._empty = self._full & ~(blockers | pieces[1] | pieces[2])
+        self._counts = [0, pieces[1].bit_count(), pieces[2].bit_count()]
+        # Per player: mask and count of pieces with an empty cell within reach
+        self._mobile = [0, 0, 0]
+        self._mobile_counts = [0, 0, 0]
+        self._update_mobility(self._full)
+        self.hash = self._compute_hash()
+        self._grid = None
+
+    def _dilate(self, mask: int) -> int:
+        """Grow a mask by one cell in all eight directions"""
+        return _dilate_mask(mask, self._cols, self._not_first_col, self._not_last_col, self._full)
+
+    def _dilate2(self, mask: int) -> int:
+        """Grow a mask by two cells in all directions in a single pass"""
+        cols = self._cols
+        row = (mask | ((mask << 1) & self._not_first_col) | ((mask << 2) & self._not_first_two_cols)
+               | ((mask >> 1) & self._not_last_col) | ((mask >> 2) & self._not_last_two_cols))
+        return (row | (row << cols) | (row << 2 * cols) | (row >> cols) | (row >> 2 * cols)) & self._full
+
+    def _iter_cells(self, mask: int):
+        """Yield (x, y) coordinates for every set bit in mask"""
+        coords = self._coords
+        while mask:
+            low = mask & -mask
+            yield coords[low.bit_length() - 1]
+            mask ^= low
+
+    def to_compact(self) -> Tuple[int, int, int, int, int]:
+        """Return (rows, cols, blockers, player 1 mask, player 2 mask)
+
+        Five integers are far cheaper to pickle than a Board, so this is the
+        form positions take when sent to worker processes.
+        """
+        return self.size[0], self.size[1], self._blockers, self._pieces[1], self._pieces[2]
+
+    @classmethod
+    def from_compact(cls, data: Tuple[int, int, int, int, int], debug: bool = DEBUG) -> 'Board':
+        """Rebuild a board from to_compact() output"""
+        rows, cols, blockers, player1, player2 = data
+        board = cls.__new__(cls)
+        board.selected_piece = None
+        board.debug = debug
+        board._load_masks((rows, cols), blockers, player1, player2)
+        return board
+
+    def copy(self) -> 'Board':
+        """Return an independent copy that shares the immutable layout index"""
+        clone = copy.copy(self)
+        clone._pieces = list(self._pieces)
+        clone._counts = list(self._counts)
+        clone._mobile = list(self._mobile)
+        clone._mobile_counts = list(self._mobile_counts)
+        clone._grid = None
+        return clone
+
+    @property
+    def board(self) -> List[List[int]]:
+        """List-of-lists view of the position, rebuilt lazily after moves.
+
+        The view is read-only: writes to it are not reflected in the masks.
+        Assign a whole grid to ``board.board`` to replace the position.
+        """
+        if self._grid is None:
+            rows, cols = self.size
+            p1, p2, blockers = self._pieces[1], self._pieces[2], self._blockers
+            grid = []
+            for x in range(rows):
+                row = []
+                for y in range(cols):
+                    bit = 1 << (x * cols + y)
+                    if p1 & bit:
+                        row.append(1)
+                    elif p2 & bit:
+                        row.append(2)
+                    elif blockers & bit:
+                        row.append(BLOCKER)
+                    else:
+                        row.append(EMPTY)
+                grid.append(row)
+            self._grid = grid
+        return self._grid
+
+    @board.setter
+    def board(self, grid: List[List[int]]):
+        self._load_grid((len(grid), len(grid[0]) if grid else 0), grid)
+
+    def get_piece(self, pos: Tuple[int, int]) -> int:
+        """Return the cell value at a position without building the grid view"""
+        x, y = pos  # Using x,y consistently
+        bit = 1 << (x * self._cols + y)
+        if self._pieces[1] & bit:
+            return 1
+        if self._pieces[2] & bit:
+            return 2
+        return BLOCKER if self._blockers & bit else EMPTY
 
     def get_valid_moves(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
         """Return list of valid moves for a piece at given position"""
-        valid_moves = []
         x, y = pos  # Using x,y consistently
-        
-        # Check adjacent cells (clone moves)
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                new_x, new_y = x + dx, y + dy
-                if self._is_valid_position((new_x, new_y)) and self.board[new_x][new_y] == 0:
-                    valid_moves.append((new_x, new_y))
-
-        # Check jump moves (two cells away)
-        for dx in [-2, -1, 0, 1, 2]:
-            for dy in [-2, -1, 0, 1, 2]:
-                if abs(dx) <= 1 and abs(dy) <= 1:
-                    continue
-                if abs(dx) > 2 or abs(dy) > 2:
-                    continue
-                new_x, new_y = x + dx, y + dy
-                if self._is_valid_position((new_x, new_y)) and self.board[new_x][new_y] == 0:
-                    valid_moves.append((new_x, new_y))
-
+        i = x * self._cols + y
+        near = self._empty >> self._reach_shifts[i]
+        targets = self._local_targets[i]
+        valid_moves = []
+        append = valid_moves.append
+        # Clone targets first, then jumps, each in board order like the original loops
+        for bits in (near & self._local_clones[i], near & self._local_jumps[i]):
+            while bits:
+                low = bits & -bits
+                append(targets[low.bit_length() - 1])
+                bits ^= low
         return valid_moves
 
+    def get_all_moves(self, player: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Return every (from_pos, to_pos) move available to a player"""
+        moves = []
+        append = moves.append
+        empty = self._empty
+        reach_shifts = self._reach_shifts
+        local_reach, local_moves = self._local_reach, self._local_moves
+        pieces = self._mobile[player]  # Pieces with no empty cell in reach have no moves
+        while pieces:
+            i = pieces.bit_length() - 1
+            pieces ^= 1 << i
+            targets = (empty >> reach_shifts[i]) & local_reach[i]
+            piece_moves = local_moves[i]
+            while targets:
+                k = targets.bit_length() - 1
+                append(piece_moves[k])
+                targets ^= 1 << k
+        return moves
+
+    def generate_moves(self, player: int) -> List[Tuple[int, int]]:
+        """Return distinct (from_index, to_index) moves for search
+
+        Clone moves that reach the same empty cell produce the same position,
+        so each clone destination appears once, taken from one adjacent piece.
+        Clones come first, then jumps.
+        """
+        moves = []
+        append = moves.append
+        clone_masks, jump_masks = self._clone_masks, self._jump_masks
+        empty = self._empty
+        own = self._pieces[player]
+
+        targets = self._dilate(own) & empty
+        while targets:
+            j = targets.bit_length() - 1
+            targets ^= 1 << j
+            append(((clone_masks[j] & own).bit_length() - 1, j))
+
+        pieces = own
+        while pieces:
+            i = pieces.bit_length() - 1
+            pieces ^= 1 << i
+            targets = jump_masks[i] & empty
+            while targets:
+                j = targets.bit_length() - 1
+                append((i, j))
+                targets ^= 1 << j
+        return moves
+
+    def generate_scored_moves(self, player: int,
+                              quiet_jumps: bool = True) -> Tuple[List[Tuple[int, int]], List[int]]:
+        """Return distinct (from_index, to_index) moves and the gain of each
+
+        The gain is the move's swing in piece difference: 2 per converted
+        piece, plus 1 for a clone. Moves are built per destination so each
+        capture count is computed once. With quiet_jumps False, jumps that
+        convert nothing are left out.
+        """
+        moves = []
+        gains = []
+        clone_masks, jump_masks = self._clone_masks, self._jump_masks
+        empty = self._empty
+        own = self._pieces[player]
+        opponent = self._pieces[3 - player]
+
+        targets = self._dilate(own) & empty
+        while targets:
+            j = targets.bit_length() - 1
+            targets ^= 1 << j
+            moves.append(((clone_masks[j] & own).bit_length() - 1, j))
+            gains.append(2 * (clone_masks[j] & opponent).bit_count() + 1)
+
+        # Jump reach is symmetric, so a destination's jump mask holds its origins
+        targets = self._dilate2(own) & empty
+        if not quiet_jumps:
+            targets &= self._dilate(opponent)
+        while targets:
+            j = targets.bit_length() - 1
+            targets ^= 1 << j
+            gain = 2 * (clone_masks[j] & opponent).bit_count()
+            if not gain and not quiet_jumps:
+                continue
+            origins = jump_masks[j] & own
+            while origins:
+                i = origins.bit_length() - 1
+                origins ^= 1 << i
+                moves.append((i, j))
+                gains.append(gain)
+        return moves, gains
+
+    def best_move_gain(self, player: int) -> int:
+        """Return the largest gain of any move (see generate_scored_moves), or -1 with no moves
+
+        Captures depend only on the destination, so this scans distinct
+        destinations next to opponent pieces instead of enumerating moves.
+        """
+        own = self._pieces[player]
+        empty = self._empty
+        clone_dests = self._dilate(own) & empty
+        jump_dests = self._dilate2(own) & empty & ~clone_dests
+        if clone_dests:
+            best = 1
+        elif jump_dests:
+            best = 0
+        else:
+            return -1
+        clone_masks = self._clone_masks
+        opponent = self._pieces[3 - player]
+        near_opponent = self._dilate(opponent)
+        for targets, bonus in ((clone_dests & near_opponent, 1), (jump_dests & near_opponent, 0)):
+            while targets:
+                j = targets.bit_length() - 1
+                targets ^= 1 << j
+                gain = 2 * (clone_masks[j] & opponent).bit_count() + bonus
+                if gain > best:
+                    best = gain
+        return best
+
     def make_move(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int], player: int) -> List[Tuple[int, int]]:
         """Execute a move and return list of converted pieces"""
-        converted_pieces = []
         fx, fy = from_pos  # Using x,y consistently
         tx, ty = to_pos
-        
+        cols = self._cols
+        record = self.apply_move(fx * cols + fy, tx * cols + ty, player)
+        return list(self._iter_cells(record[3]))
+
+    def apply_move(self, from_index: int, to_index: int, player: int) -> UndoRecord:
+        """Execute a move given as cell indices and return its undo record
+
+        to_index must be an empty cell; piece counts are updated from the
+        moving piece, the vacated jump origin and the converted pieces.
+        """
+        from_bit = 1 << from_index
+        to_bit = 1 << to_index
+        opponent = 3 - player
+        pieces = self._pieces
+        counts = self._counts
+
         # Determine if this is a jump or clone move
-        is_jump = max(abs(tx - fx), abs(ty - fy)) > 1
-        
+        is_jump = not self._clone_masks[from_index] & to_bit
+
         # Make the move
+        keys = self._piece_keys[player]
         if is_jump:
-            self.board[fx][fy] = 0
-        self.board[tx][ty] = player
-        
+            pieces[player] ^= from_bit
+            self._empty |= from_bit
+            self.hash ^= keys[from_index]
+        else:
+            counts[player] += 1
+        self._empty ^= to_bit
+
         # Convert adjacent pieces
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                new_x, new_y = tx + dx, ty + dy
-                if self._is_valid_position((new_x, new_y)) and self.board[new_x][new_y] == (3 - player):
-                    self.board[new_x][new_y] = player
-                    converted_pieces.append((new_x, new_y))
-        
-        return converted_pieces
+        converted = self._clone_masks[to_index] & pieces[opponent]
+        pieces[opponent] ^= converted
+        pieces[player] |= converted | to_bit
+        flipped = converted.bit_count()
+        counts[player] += flipped
+        counts[opponent] -= flipped
+        self.hash ^= keys[to_index] ^ self._flip_hash(converted)
+
+        # Only pieces within distance 2 of the origin or destination can
+        # gain or lose access to an empty cell
+        reach_masks = self._reach_masks
+        self._update_mobility(reach_masks[to_index] | reach_masks[from_index] | to_bit | from_bit)
+        self._grid = None
+
+        return from_index, to_index, is_jump, converted
+
+    def unmake_move(self, record: UndoRecord):
+        """Restore the position from before the move that produced record"""
+        from_index, to_index, is_jump, converted = record
+        from_bit = 1 << from_index
+        to_bit = 1 << to_index
+        pieces = self._pieces
+        counts = self._counts
+        player = 1 if pieces[1] & to_bit else 2
+        opponent = 3 - player
+
+        pieces[player] ^= converted | to_bit
+        pieces[opponent] |= converted
+        self._empty |= to_bit
+        flipped = converted.bit_count()
+        counts[player] -= flipped
+        counts[opponent] += flipped
+        keys = self._piece_keys[player]
+        self.hash ^= keys[to_index] ^ self._flip_hash(converted)
+        if is_jump:
+            pieces[player] |= from_bit
+            self._empty ^= from_bit
+            self.hash ^= keys[from_index]
+        else:
+            counts[player] -= 1
+
+        reach_masks = self._reach_masks
+        self._update_mobility(reach_masks[to_index] | reach_masks[from_index] | to_bit | from_bit)
+        self._grid = None
+
+    def index(self, pos: Tuple[int, int]) -> int:
+        """Return the bit index of a board position"""
+        x, y = pos  # Using x,y consistently
+        return x * self._cols + y
+
+    def position(self, index: int) -> Tuple[int, int]:
+        """Return the board position of a bit index"""
+        return self._coords[index]
+
+    def mask_to_cells(self, mask: int) -> List[Tuple[int, int]]:
+        """Return the positions of every set bit in mask"""
+        return list(self._iter_cells(mask))
+
+    def _flip_hash(self, converted: int) -> int:
+        """Zobrist delta for swapping the owner of every cell in converted"""
+        flip_keys = self._flip_keys
+        delta = 0
+        while converted:
+            i = converted.bit_length() - 1
+            converted ^= 1 << i
+            delta ^= flip_keys[i]
+        return delta
+
+    def _compute_hash(self) -> int:
+        """Zobrist hash of the placement from scratch (layout plus pieces)"""
+        key = self.layout.base_key
+        for player in (1, 2):
+            keys = self._piece_keys[player]
+            pieces = self._pieces[player]
+            while pieces:
+                i = pieces.bit_length() - 1
+                pieces ^= 1 << i
+                key ^= keys[i]
+        return key
+
+    def position_key(self, player: int) -> int:
+        """Zobrist hash of the placement with `player` to move"""
+        return self.hash ^ SIDE_KEY if player == 2 else self.hash
+
+    def _update_mobility(self, region: int):
+        """Recompute which pieces inside region have an empty cell within distance 2"""
+        # Shifting the empty mask costs a handful of big-int operations, which
+        # is cheaper than testing each piece's reach mask, but only the
+        # region's bits are taken from it
+        near_empty = self._dilate2(self._empty) & region
+        mobile = self._mobile
+        counts = self._mobile_counts
+        for player in (1, 2):
+            old = mobile[player] & region
+            new = self._pieces[player] & near_empty
+            if old != new:
+                mobile[player] ^= old ^ new
+                counts[player] += new.bit_count() - old.bit_count()
 
     def _is_valid_position(self, pos: Tuple[int, int]) -> bool:
         """Check if a position is valid and traversable on the board"""
         x, y = pos  # Using x,y consistently
-        return (0 <= x < self.size[0] and 
-                0 <= y < self.size[1] and 
-                self.board[x][y] != 9)  # 9 indicates untraversable cell
+        return (0 <= x < self.size[0] and
+                0 <= y < self.size[1] and
+                not self._blockers >> (x * self._cols + y) & 1)  # 9 indicates untraversable cell
 
     def get_piece_counts(self) -> Tuple[int, int]:
         """Return the count of pieces for each player"""
-        count_1 = sum(row.count(1) for row in self.board)
-        count_2 = sum(row.count(2) for row in self.board)
-        return count_1, count_2
+        if self.debug:
+            assert self.hash == self._compute_hash(), "Incremental Zobrist hash is out of sync"
+            scanned = self._scan_piece_counts()
+            assert scanned == (self._counts[1], self._counts[2]), \
+                f"Running piece counts {self._counts[1:]} disagree with board scan {scanned}"
+        return self._counts[1], self._counts[2]
+
+    def _scan_piece_counts(self) -> Tuple[int, int]:
+        """Count pieces with a full scan of the board view (debug check)"""
+        grid = self.board
+        return sum(row.count(1) for row in grid), sum(row.count(2) for row in grid)
 
     def has_valid_moves(self, player: int) -> bool:
         """Check if a player has any valid moves available"""
-        for x in range(self.size[0]):
-            for y in range(self.size[1]):
-                if self.board[x][y] == player and self.get_valid_moves((x, y)):
-                    return True
-        return False
\ No newline at end of file
+        if self.debug:
+            scanned = bool(self._dilate2(self._pieces[player]) & self._empty)
+            assert scanned == (self._mobile_counts[player] > 0), \
+                f"Mobility count {self._mobile_counts[player]} for player {player} disagrees with scan"
+        return self._mobile_counts[player] > 0
+
+    def mobility(self, player: int) -> int:
+        """Number of the player's pieces with an empty cell within reach"""
+        return self._mobile_counts[player]
+
+    def empty_count(self) -> int:
+        """Number of empty cells, derived from the running piece counts"""
+        empty = self._open_cells - self._counts[1] - self._counts[2]
+        if self.debug:
+            assert empty == self._empty.bit_count(), \
+                f"Empty count {empty} disagrees with empty mask {self._empty.bit_count()}"
+        return empty
+
+    def next_player(self, mover: int) -> int:
+        """Side to move after mover has moved, with GameState's pass rule; 0 if the game is over"""
+        if self._counts[1] == 0 or self._counts[2] == 0:
+            return 0
+        if self.has_valid_moves(3 - mover):
+            return 3 - mover
+        return mover if self.has_valid_moves(mover) else 0
@@ -0,0 +1,139 @@
+"""Opening book: stored moves for early positions, kept in a sorted binary file.
+
+File layout (little-endian): a 16-byte header (magic, version, entry count)
+followed by fixed 16-byte records (key u64, from_index u16, to_index u16,
+score i16, weight u16) sorted by key. Keys are Board.position_key() values,
+which include the level's size and blockers, so one book can cover every
+level. Lookups binary-search an mmap of the file: opening a book only reads
+the header, and a probe unpacks about log2(entries) keys.
+
+Build a book with ``python -m game.book_builder`` (see --help for options).
+"""
+import mmap
+import os
+import struct
+from functools import lru_cache
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from .board import Board
+
+MAGIC = b'ATXBOOK\0'
+VERSION = 1
+HEADER = struct.Struct('<8sII')  # magic, version, entry count
+RECORD = struct.Struct('<QHHhH')  # key, from_index, to_index, score, weight
+KEY = struct.Struct('<Q')
+
+# Book shipped with the app, relative to the working directory like levels.txt
+DEFAULT_BOOK_PATH = 'assets/book.bin'
+
+
+class BookEntry(NamedTuple):
+    key: int
+    from_index: int
+    to_index: int
+    score: int  # Search score, or mean final piece difference for self-play entries
+    weight: int  # Search depth, or number of self-play games behind the move
+
+
+class OpeningBook:
+    """Read-only view of a book file; use as a context manager or call close()"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self._file.close()
+            raise ValueError(f'{path} is not an opening book')
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f'{path} is not an opening book')
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or HEADER.size + count * RECORD.size > len(self._map):
+            self.close()
+            raise ValueError(f'{path} is not an opening book (or is truncated)')
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def probe(self, key: int) -> Optional[BookEntry]:
+        """Binary search the file for a position key"""
+        data = self._map
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if KEY.unpack_from(data, HEADER.size + mid * RECORD.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count:
+            entry = BookEntry._make(RECORD.unpack_from(data, HEADER.size + lo * RECORD.size))
+            if entry.key == key:
+                return entry
+        return None
+
+    def lookup(self, board: Board, player: int) -> Optional[BookEntry]:
+        """Book entry for the position, if present and its move is legal there"""
+        entry = self.probe(board.position_key(player))
+        if entry is None or not _is_legal(board, player, entry.from_index, entry.to_index):
+            return None  # Not in the book, or a hash collision
+        return entry
+
+    def entries(self) -> Iterator[BookEntry]:
+        """Every entry in key order"""
+        for i in range(self.count):
+            yield BookEntry._make(RECORD.unpack_from(self._map, HEADER.size + i * RECORD.size))
+
+
+def _is_legal(board: Board, player: int, from_index: int, to_index: int) -> bool:
+    cells = board.layout.cells
+    if from_index >= cells or to_index >= cells:
+        return False
+    from_pos, to_pos = board.position(from_index), board.position(to_index)
+    distance = max(abs(from_pos[0] - to_pos[0]), abs(from_pos[1] - to_pos[1]))
+    return (board.get_piece(from_pos) == player and board.get_piece(to_pos) == 0
+            and 1 <= distance <= 2)
+
+
+@lru_cache(maxsize=4)
+def open_book(path: str = DEFAULT_BOOK_PATH) -> Optional[OpeningBook]:
+    """Shared book for path, or None if it is missing or unreadable"""
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError):
+        return None
+
+
+def write_book(path: str, entries: Iterable[BookEntry]) -> int:
+    """Write entries sorted by key (later duplicates win); returns the entry count
+
+    The file is written beside path and renamed over it, so readers that
+    still have the old book mapped are not disturbed.
+    """
+    by_key = {entry.key: entry for entry in entries}
+    keys = sorted(by_key)
+    data = bytearray(HEADER.size + len(keys) * RECORD.size)
+    HEADER.pack_into(data, 0, MAGIC, VERSION, len(keys))
+    offset = HEADER.size
+    for key in keys:
+        RECORD.pack_into(data, offset, *by_key[key])
+        offset += RECORD.size
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(keys)
@@ -0,0 +1,150 @@
+"""Builds opening books from deep search or from self-play games.
+
+``python -m game.book_builder --source search --plies 4 --depth 5`` writes
+assets/book.bin for every level in levels.txt; add --merge to keep the
+entries already in the output file.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from typing import Dict, List
+
+from .board import Board
+from .book import DEFAULT_BOOK_PATH, BookEntry, OpeningBook, write_book
+from .engine import SearchEngine
+from .game_state import GameState
+from .options import PVP
+from .players import RandomPlayer, create_player
+
+
+def _clamp_score(score: float) -> int:
+    return max(-32768, min(32767, round(score)))
+
+
+def build_from_search(levels: List[dict], plies: int, depth: int, width: int = 2,
+                      log=None) -> Dict[int, BookEntry]:
+    """Search every position reachable within plies, following each side's top width moves"""
+    engine = SearchEngine(max_depth=depth, time_limit=None)
+    book = {}
+    for level in levels:
+        board = Board()
+        board.load_from_json(level)
+        frontier = [(board, 1)]
+        for ply in range(plies):
+            next_frontier = []
+            for position, player in frontier:
+                key = position.position_key(player)
+                if key in book:
+                    continue  # Reached by transposition
+                ranked = _rank_moves(engine, position, player, width)
+                if not ranked:
+                    continue
+                (from_index, to_index), score = ranked[0]
+                book[key] = BookEntry(key, from_index, to_index, _clamp_score(score), depth)
+                for (from_index, to_index), _ in ranked:
+                    child = position.copy()
+                    child.apply_move(from_index, to_index, player)
+                    next_frontier.append((child, child.next_player(player)))
+            frontier = [(b, p) for b, p in next_frontier if p]
+            if log:
+                log(f"{level['name']}: ply {ply + 1}, {len(book)} entries")
+    return book
+
+
+def _rank_moves(engine: SearchEngine, board: Board, player: int, width: int):
+    """Top width moves by search score, best first"""
+    moves = board.generate_moves(player)
+    scored = []
+    for from_index, to_index in moves:
+        child = board.copy()
+        child.apply_move(from_index, to_index, player)
+        # The negamax handles passes and finished games itself
+        score = -engine.score_position(child, 3 - player, engine.max_depth - 1)
+        scored.append(((from_index, to_index), score))
+    scored.sort(key=lambda pair: -pair[1])
+    return scored[:width]
+
+
+def build_from_selfplay(levels: List[dict], games: int, plies: int, player_spec: str = 'greedy',
+                        min_games: int = 2, seed: int = 1, log=None) -> Dict[int, BookEntry]:
+    """Play games with random opening moves, then keep the best-scoring move per position
+
+    Each game opens with plies random moves and is finished by player_spec
+    for both sides. A move's score is the mean final piece difference for the
+    side that played it; moves seen in fewer than min_games games are ignored.
+    """
+    rng = random.Random(seed)
+    stats = {}  # key -> {(from_index, to_index): [total difference, games]}
+    for level in levels:
+        for _ in range(games):
+            opening = RandomPlayer(rng.getrandbits(32))
+            finisher = create_player(player_spec, rng.getrandbits(32))
+            state = GameState()
+            state.start_new_game(level, PVP, None)
+            played = []  # (key, move, mover)
+            while not state.is_game_over:
+                opening_phase = len(state.history) < plies
+                mover = state.current_player
+                key = state.board.position_key(mover)
+                move = (opening if opening_phase else finisher).choose_move(state)
+                if move is None or state.apply_move(move) is None:
+                    break
+                if opening_phase:
+                    board = state.board
+                    played.append((key, (board.index(move[0]), board.index(move[1])), mover))
+            p1_count, p2_count = state.board.get_piece_counts()
+            for key, move, mover in played:
+                difference = p1_count - p2_count if mover == 1 else p2_count - p1_count
+                totals = stats.setdefault(key, {}).setdefault(move, [0, 0])
+                totals[0] += difference
+                totals[1] += 1
+        if log:
+            log(f"{level['name']}: {games} games, {len(stats)} positions")
+
+    book = {}
+    for key, moves in stats.items():
+        candidates = [(total / count, count, move) for move, (total, count) in moves.items()
+                      if count >= min_games]
+        if candidates:
+            mean, count, (from_index, to_index) = max(candidates)
+            book[key] = BookEntry(key, from_index, to_index, _clamp_score(mean), min(count, 65535))
+    return book
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build an Ataxx opening book')
+    parser.add_argument('--levels', default='levels.txt')
+    parser.add_argument('--output', default=DEFAULT_BOOK_PATH)
+    parser.add_argument('--source', choices=('search', 'selfplay'), default='search')
+    parser.add_argument('--plies', type=int, default=4, help='book depth in plies from the start')
+    parser.add_argument('--depth', type=int, default=5, help='search depth per position (search)')
+    parser.add_argument('--width', type=int, default=2, help='moves followed per position (search)')
+    parser.add_argument('--games', type=int, default=200, help='games per level (selfplay)')
+    parser.add_argument('--player', default='greedy', help='player that finishes games (selfplay)')
+    parser.add_argument('--merge', action='store_true', help='keep entries already in --output')
+    args = parser.parse_args()
+
+    def log(message):
+        print(message, flush=True)
+
+    with open(args.levels, 'r') as f:
+        levels = json.load(f)
+    start = time.perf_counter()
+    if args.source == 'search':
+        book = build_from_search(levels, args.plies, args.depth, args.width, log)
+    else:
+        book = build_from_selfplay(levels, args.games, args.plies, args.player, log=log)
+
+    entries = []
+    if args.merge and os.path.exists(args.output):
+        with OpeningBook(args.output) as existing:
+            entries.extend(existing.entries())
+    entries.extend(book.values())
+    count = write_book(args.output, entries)
+    print(f'Wrote {count} entries to {args.output} in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
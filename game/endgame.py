@@ -0,0 +1,245 @@
+"""Endgame solver for positions with few empty cells.
+
+Searches to the end of the game with alpha-beta and returns the final piece
+difference (side to move minus opponent) under best play. Passes follow
+GameState.make_move: a player without moves is skipped, and the game ends
+when a side has no pieces or neither side can move.
+
+Jumps do not fill a cell, so without a limit play could go on forever.
+A line with more than ``jump_limit`` consecutive jumps is cut off and scored
+by piece count at that point. Such a score is only an estimate, so the
+solver tracks which scores rest on finished games alone: the result is exact
+only if its score does, and callers should treat any other result as a
+heuristic one. The jump count is part of the solve-table key.
+
+Run ``python -m game.endgame --empties 4`` to time solves of sample positions.
+"""
+import argparse
+import random
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from .benchmarking import load_levels, print_report, random_playout
+from .board import Board
+from .search_common import Move, SearchBudget, bound_flag, ordered_moves, table_cutoff
+from .transposition import EXACT, TranspositionTable
+
+# Solve positions with at most this many empty cells. Jumps give late
+# positions a branching factor near 100, so a pure-Python solve of 5 or more
+# empty cells on 7x7 levels usually takes seconds
+DEFAULT_THRESHOLD = 4
+
+# Consecutive jumps allowed on a line before it is adjudicated
+DEFAULT_JUMP_LIMIT = 2
+
+_rng = random.Random(0xE7D6A3)
+
+
+def _entry_depth(board: Board, proven: bool) -> int:
+    """Solve-table depth field: empty cells for replacement, low bit set if proven"""
+    return min(board.empty_count(), 127) << 1 | proven
+
+
+class EndgameResult(NamedTuple):
+    move: Optional[Move]  # (from_pos, to_pos), None if the side to move must pass
+    differential: int  # Final own minus opponent piece count under best play
+    nodes: int
+    elapsed: float
+    exact: bool  # False if the differential depends on a line cut off at the jump limit
+
+
+class SolveTimeout(Exception):
+    """Raised when the solver's node or time budget runs out"""
+
+
+class EndgameSolver:
+    """Alpha-beta to the end of the game with its own solve table.
+
+    Every score carries a proof flag. A score is proven when it rests only on
+    finished games: a cutoff needs its refuting move proven, any other node
+    needs every move it searched proven, and a line scored at the jump limit
+    is unproven. Solve-table entries keep the flag and do not depend on search
+    depth, so the table is kept across solves: later moves of the same
+    endgame are mostly answered from it.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, jump_limit: int = DEFAULT_JUMP_LIMIT,
+                 table_size_mb: float = 4):
+        self.threshold = threshold
+        self.jump_limit = jump_limit
+        # Folded into position keys so states with different jump counts never share entries
+        self._run_keys = [0] + [_rng.getrandbits(64) for _ in range(jump_limit + 1)]
+        self.table = TranspositionTable(table_size_mb)
+        self.nodes = 0
+        self.adjudications = 0
+        self._budget = SearchBudget(SolveTimeout)
+
+    def applies(self, board: Board) -> bool:
+        """Whether the position is small enough to solve"""
+        return board.empty_count() <= self.threshold
+
+    def solve(self, board: Board, player: int, time_limit: Optional[float] = None,
+              node_limit: Optional[int] = None, stop_event=None, exact_only: bool = False) -> EndgameResult:
+        """Solve the position with `player` to move
+
+        With exact_only, the solve stops as soon as a root move fails to get
+        a proven score, since the result can then no longer be exact.
+        Raises SolveTimeout if the time or node budget runs out or
+        stop_event is set first.
+        """
+        start = time.perf_counter()
+        self.nodes = 0
+        self.adjudications = 0
+        self._budget.start(start + time_limit if time_limit else None, node_limit, stop_event)
+        self.table.new_search()
+
+        move = None
+        if board.has_valid_moves(player):
+            differential, proven, move = self._solve_root(board, player, exact_only)
+            move = (board.position(move[0]), board.position(move[1]))
+        else:
+            differential, proven = self._solve(board, player, -board.layout.cells - 1,
+                                               board.layout.cells + 1, 0)
+        return EndgameResult(move, differential, self.nodes, time.perf_counter() - start, proven)
+
+    def _solve_root(self, board: Board, player: int, exact_only: bool) -> Tuple[int, bool, Tuple[int, int]]:
+        bound = board.layout.cells + 1
+        alpha, beta = -bound, bound
+        key = board.position_key(player)
+        entry = self.table.probe(key)
+        moves = ordered_moves(board, player, entry[3] if entry else None)
+        best_move = moves[0]
+        proven = True
+        for move in moves:
+            record = board.apply_move(move[0], move[1], player)
+            try:
+                score, move_proven = self._solve(board, 3 - player, -beta, -alpha, 1 if record[2] else 0)
+            finally:
+                board.unmake_move(record)
+            score = -score
+            proven = proven and move_proven
+            if score > alpha:
+                alpha, best_move = score, move
+            if exact_only and not proven:
+                return alpha, False, best_move
+        self.table.store(key, _entry_depth(board, proven), alpha, EXACT, best_move)
+        return alpha, proven, best_move
+
+    def _solve(self, board: Board, player: int, alpha: int, beta: int, jumps: int) -> Tuple[int, bool]:
+        """Negamax (score, proven) with jumps consecutive jumps played on the line so far"""
+        self.nodes += 1
+        if self.nodes >= self._budget.next_check:
+            self._budget.check(self.nodes)
+
+        opponent = 3 - player
+        counts = board.get_piece_counts()
+        own, other = counts[player - 1], counts[opponent - 1]
+        if not own or not other:
+            return own - other, True
+        if not board.has_valid_moves(player):
+            if not board.has_valid_moves(opponent):
+                return own - other, True
+            # The side to move passes
+            score, proven = self._solve(board, opponent, -beta, -alpha, jumps)
+            return -score, proven
+        if jumps > self.jump_limit:
+            self.adjudications += 1
+            return own - other, False
+
+        key = board.position_key(player) ^ self._run_keys[jumps]
+        entry = self.table.probe(key)
+        tt_move = None
+        if entry:
+            entry_depth, entry_score, flag, tt_move = entry
+            if table_cutoff(flag, entry_score, alpha, beta):
+                return entry_score, bool(entry_depth & 1)
+
+        # Even converting every opponent piece and filling every empty cell
+        # cannot beat this
+        ceiling = own + other + board.empty_count()
+        if ceiling <= alpha:
+            return ceiling, True
+
+        original_alpha = alpha
+        best_score = -ceiling - 1
+        best_move = None
+        proven = True  # Every move searched so far has a proven score
+        for n, move in enumerate(ordered_moves(board, player, tt_move)):
+            record = board.apply_move(move[0], move[1], player)
+            # Clones fill a cell and reset the jump count
+            next_jumps = jumps + 1 if record[2] else 0
+            try:
+                if n == 0:
+                    score, move_proven = self._solve(board, opponent, -beta, -alpha, next_jumps)
+                else:
+                    score, move_proven = self._solve(board, opponent, -alpha - 1, -alpha, next_jumps)
+                    if alpha < -score < beta:
+                        score, move_proven = self._solve(board, opponent, -beta, score, next_jumps)
+            finally:
+                board.unmake_move(record)
+            score = -score
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        # A cutoff rests on the refuting move alone
+                        proven = move_proven
+                        break
+            proven = proven and move_proven
+
+        self.table.store(key, _entry_depth(board, proven), best_score,
+                         bound_flag(best_score, original_alpha, beta), best_move)
+        return best_score, proven
+
+
+def _sample_positions(levels: List[dict], empties: int, count: int, seed: int) -> List[Tuple[Board, int]]:
+    """Positions with exactly `empties` empty cells, reached by random play"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        for board, player in random_playout(rng.choice(levels), rng):
+            if board.empty_count() <= empties:
+                if board.empty_count() == empties:
+                    positions.append((board, player))
+                break
+    return positions
+
+
+def benchmark(levels_path: str, empties: int, count: int, jump_limit: int, time_limit: float,
+              seed: int = 1) -> dict:
+    """Solve sample positions and summarise solve times and node counts"""
+    levels = load_levels(levels_path)
+    times, nodes, timeouts, exact = [], [], 0, 0
+    for board, player in _sample_positions(levels, empties, count, seed):
+        solver = EndgameSolver(threshold=empties, jump_limit=jump_limit)
+        try:
+            result = solver.solve(board, player, time_limit)
+        except SolveTimeout:
+            timeouts += 1
+            continue
+        times.append(result.elapsed)
+        nodes.append(result.nodes)
+        exact += result.exact
+    solved = len(times)
+    return {'empties': empties, 'jump_limit': jump_limit, 'positions': count, 'solved': solved,
+            'timeouts': timeouts, 'exact': exact,
+            'mean_seconds': round(sum(times) / solved, 4) if solved else None,
+            'max_seconds': round(max(times), 4) if solved else None,
+            'mean_nodes': round(sum(nodes) / solved) if solved else None,
+            'nps': round(sum(nodes) / sum(times)) if solved and sum(times) else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the endgame solver')
+    parser.add_argument('--levels', default='levels.txt')
+    parser.add_argument('--empties', type=int, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--positions', type=int, default=20)
+    parser.add_argument('--jump-limit', type=int, default=DEFAULT_JUMP_LIMIT)
+    parser.add_argument('--time-limit', type=float, default=10.0, help='seconds per solve')
+    args = parser.parse_args()
+    print_report(benchmark(args.levels, args.empties, args.positions, args.jump_limit, args.time_limit))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""Computer opponent: negamax alpha-beta search over the Board rules."""
+import time
+from typing import NamedTuple, Optional, Tuple
+
+from .board import Board
+from .endgame import DEFAULT_THRESHOLD, EndgameSolver, SolveTimeout
+from .options import DEFAULT_DIFFICULTY, DIFFICULTY_LEVELS
+from .search_common import Move, SearchBudget, bound_flag, order_moves, ordered_moves, table_cutoff
+from .transposition import EXACT, TranspositionTable
+
+# Terminal positions score beyond any material difference
+WIN_SCORE = 10000
+INFINITY = 1 << 20
+
+# A loss found after skipping moves: worse than any material score, but not
+# a forced result, since a skipped move might escape it
+UNPROVEN_LOSS = 1 - WIN_SCORE
+
+# Jumps that capture nothing are skipped at nodes this close to the horizon
+QUIET_JUMP_PRUNE_DEPTH = 3
+
+# Most pieces a single move converts
+MAX_CAPTURE = 8
+
+# Half-width of the root search window around the previous iteration's score
+ASPIRATION_WINDOW = 3
+
+# Late move reductions: moves after the first few that capture nothing are
+# searched shallower first, at nodes at least LMR_MIN_DEPTH deep
+LMR_MIN_MOVES = 3
+LMR_DEEP_MOVES = 10  # Moves this late are reduced by two plies
+LMR_MIN_DEPTH = 3
+
+# Share of the time limit the endgame solver may use before falling back to
+# the heuristic search, which it also does when it cannot prove the result
+ENDGAME_TIME_SHARE = 0.5
+
+class SearchResult(NamedTuple):
+    move: Optional[Move]  # (from_pos, to_pos), None if the side to move must pass
+    score: int  # From the searching player's point of view
+    depth: int  # Deepest fully completed iteration
+    nodes: int
+    elapsed: float
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the node or time budget runs out"""
+
+
+class SearchCancelled(Exception):
+    """Raised out of search() when its stop event is set"""
+
+
+class SearchEngine:
+    """Iterative-deepening negamax with alpha-beta pruning.
+
+    Moves are ordered by the transposition-table move first, then by how many
+    pieces they capture (clones before jumps on ties). The search stops when
+    ``max_depth`` is reached or the ``time_limit`` (seconds) or ``node_limit``
+    budget is used up, and returns the best move of the last finished depth.
+    Positions found in the optional opening book are answered without a search,
+    and positions with at most ``endgame_empties`` empty cells are first
+    handed to the endgame solver (0 disables it), whose result is used only
+    when it is exact.
+    """
+
+    def __init__(self, max_depth: int = 64, time_limit: Optional[float] = 1.0,
+                 node_limit: Optional[int] = None, tt_size_mb: float = 16, book=None,
+                 endgame_empties: int = DEFAULT_THRESHOLD):
+        self.max_depth = max_depth
+        self.book = book
+        self.solver = EndgameSolver(endgame_empties) if endgame_empties > 0 else None
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.tt = TranspositionTable(tt_size_mb)
+        self.nodes = 0
+        self._history = {}  # (from_index, to_index) -> beta cutoff credit
+        self._budget = SearchBudget(SearchTimeout)
+
+    @classmethod
+    def for_difficulty(cls, difficulty: str, book=None) -> 'SearchEngine':
+        """Create an engine with the budget of a named difficulty level
+
+        book is an OpeningBook, used only if the level allows it.
+        """
+        settings = dict(DIFFICULTY_LEVELS.get(difficulty, DIFFICULTY_LEVELS[DEFAULT_DIFFICULTY]))
+        if not settings.pop('use_book', True):
+            book = None
+        return cls(book=book, **settings)
+
+    def choose_move(self, game_state) -> Optional[Move]:
+        """Pick a move for the current player of a GameState"""
+        return self.search(game_state.board, game_state.current_player).move
+
+    def search(self, board: Board, player: int, stop_event=None, on_iteration=None) -> SearchResult:
+        """Search the position with `player` to move within the budget
+
+        stop_event is an optional threading.Event; setting it from another
+        thread aborts the search with SearchCancelled. on_iteration, if
+        given, is called with the SearchResult of each completed depth.
+        """
+        start = time.perf_counter()
+        if self.book is not None:
+            entry = self.book.lookup(board, player)
+            if entry is not None:
+                return SearchResult((board.position(entry.from_index), board.position(entry.to_index)),
+                                    entry.score, 0, 0, time.perf_counter() - start)
+        if self.solver is not None and self.solver.applies(board) and board.has_valid_moves(player):
+            solve_time = self.time_limit * ENDGAME_TIME_SHARE if self.time_limit else None
+            try:
+                solved = self.solver.solve(board, player, solve_time, self.node_limit, stop_event,
+                                           exact_only=True)
+            except SolveTimeout:
+                if stop_event is not None and stop_event.is_set():
+                    raise SearchCancelled()
+            else:
+                if solved.exact:
+                    return SearchResult(solved.move, self._result_score(solved.differential),
+                                        board.empty_count(), solved.nodes, time.perf_counter() - start)
+        self._budget.start(start + self.time_limit if self.time_limit else None, self.node_limit, stop_event)
+        self.nodes = 0
+        self._history = {}
+        self.tt.new_search()
+
+        moves = ordered_moves(board, player, None)
+        if not moves:
+            return SearchResult(None, self._evaluate(board, player), 0, 0, 0.0)
+        best_move = moves[0]
+        best_score = -INFINITY
+        completed = 0
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                if depth > 1 and abs(best_score) < WIN_SCORE:
+                    # Aspiration window around the previous score, widened on failure
+                    alpha, beta = best_score - ASPIRATION_WINDOW, best_score + ASPIRATION_WINDOW
+                    score, move = self._search_root(board, player, depth, alpha, beta)
+                    if score <= alpha or score >= beta:
+                        score, move = self._search_root(board, player, depth, -INFINITY, INFINITY)
+                else:
+                    score, move = self._search_root(board, player, depth, -INFINITY, INFINITY)
+            except SearchTimeout:
+                if stop_event is not None and stop_event.is_set():
+                    raise SearchCancelled()
+                break
+            best_score, best_move, completed = score, move, depth
+            if on_iteration is not None:
+                on_iteration(SearchResult((board.position(move[0]), board.position(move[1])), score,
+                                          depth, self.nodes, time.perf_counter() - start))
+            if abs(score) >= WIN_SCORE:
+                break  # Forced result found; deeper search cannot change it
+            if len(moves) == 1:
+                break
+
+        elapsed = time.perf_counter() - start
+        return SearchResult((board.position(best_move[0]), board.position(best_move[1])),
+                            best_score, completed, self.nodes, elapsed)
+
+    def score_position(self, board: Board, player: int, depth: int, alpha: int = -INFINITY,
+                       beta: int = INFINITY, time_limit: Optional[float] = None,
+                       new_search: bool = True) -> int:
+        """Fixed-depth negamax score with `player` to move, inside (alpha, beta)
+
+        Raises SearchTimeout if time_limit seconds pass first. The
+        transposition table and history are kept between calls. Pass
+        new_search=False when the call continues a search already under
+        way, so its table entries are not aged.
+        """
+        self._budget.start(time.perf_counter() + time_limit if time_limit else None, self.node_limit)
+        self.nodes = 0
+        if new_search:
+            self.tt.new_search()
+        return self._negamax(board, player, depth, alpha, beta)
+
+    def _search_root(self, board: Board, player: int, depth: int,
+                     alpha: int, beta: int) -> Tuple[int, Tuple[int, int]]:
+        """Search every root move to depth and return (score, best move)"""
+        entry = self.tt.probe(board.position_key(player))
+        moves = ordered_moves(board, player, entry[3] if entry else None, self._history)
+        original_alpha = alpha
+        best_move = moves[0]
+        for n, move in enumerate(moves):
+            record = board.apply_move(move[0], move[1], player)
+            try:
+                if n == 0:
+                    score = -self._negamax(board, 3 - player, depth - 1, -beta, -alpha)
+                else:
+                    score = -self._negamax(board, 3 - player, depth - 1, -alpha - 1, -alpha)
+                    if alpha < score < beta:
+                        score = -self._negamax(board, 3 - player, depth - 1, -beta, -score)
+            finally:
+                board.unmake_move(record)
+            if score > alpha:
+                alpha = score
+                best_move = move
+                if alpha >= beta:
+                    break
+        if original_alpha < alpha < beta:
+            self.tt.store(board.position_key(player), depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, board: Board, player: int, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if self.nodes >= self._budget.next_check:
+            self._budget.check(self.nodes)
+
+        opponent = 3 - player
+        counts = board.get_piece_counts()
+        own, other = counts[player - 1], counts[opponent - 1]
+        if not own or not other:
+            return self._final_score(counts, player)
+
+        if not board.has_valid_moves(player):
+            if not board.has_valid_moves(opponent):
+                return self._final_score(counts, player)
+            # Forced pass: the opponent moves again, as in GameState.make_move
+            return -self._negamax(board, opponent, depth, -beta, -alpha)
+
+        if depth <= 0:
+            return own - other
+
+        if depth == 1:
+            # Frontier: every child is a leaf scored by material, so take the
+            # best move's swing directly instead of making each move
+            best = board.best_move_gain(player)
+            if best >= 2 * other:
+                return WIN_SCORE + own - other + best  # Captures every opponent piece
+            return own - other + best
+
+        key = board.position_key(player)
+        entry = self.tt.probe(key)
+        tt_move = None
+        if entry:
+            entry_depth, entry_score, flag, tt_move = entry
+            if entry_depth >= depth and table_cutoff(flag, entry_score, alpha, beta):
+                return entry_score
+
+        pruning = depth <= QUIET_JUMP_PRUNE_DEPTH and self._can_prune(board, player, depth, own, other)
+        moves, gains = board.generate_scored_moves(player, quiet_jumps=not pruning)
+        skipped = pruning
+        if not moves:
+            moves, gains = board.generate_scored_moves(player)
+            skipped = False
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        # One ply above the frontier the opponent's reply cannot gain them a
+        # negative amount, so a move whose own swing cannot lift the material
+        # difference above alpha is futile
+        futility_base = own - other if pruning and depth == 2 else None
+        for n, i in enumerate(order_moves(moves, gains, tt_move, self._history)):
+            if n and futility_base is not None and futility_base + gains[i] <= alpha:
+                skipped = True
+                break  # Remaining moves swing even less
+            move = moves[i]
+            record = board.apply_move(move[0], move[1], player)
+            try:
+                if n == 0:
+                    score = -self._negamax(board, opponent, depth - 1, -beta, -alpha)
+                else:
+                    # Late quiet moves are first tried at reduced depth
+                    reduction = 0
+                    if n >= LMR_MIN_MOVES and depth >= LMR_MIN_DEPTH and not record[3]:
+                        reduction = 2 if n >= LMR_DEEP_MOVES and depth > LMR_MIN_DEPTH else 1
+                    # Principal variation search: prove the move is no better
+                    # with a null window, re-search only if it is
+                    score = -self._negamax(board, opponent, depth - 1 - reduction, -alpha - 1, -alpha)
+                    if score > alpha and reduction:
+                        score = -self._negamax(board, opponent, depth - 1, -alpha - 1, -alpha)
+                    if alpha < score < beta:
+                        score = -self._negamax(board, opponent, depth - 1, -beta, -score)
+            finally:
+                board.unmake_move(record)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self._history[move] = self._history.get(move, 0) + depth * depth
+                        break
+
+        if skipped and best_score <= -WIN_SCORE:
+            best_score = UNPROVEN_LOSS
+        self.tt.store(key, depth, best_score, bound_flag(best_score, original_alpha, beta), best_move)
+        return best_score
+
+    @staticmethod
+    def _can_prune(board: Board, player: int, depth: int, own: int, other: int) -> bool:
+        """Whether no skipped move could be needed to avoid a wipeout or a pass within depth plies
+
+        Each move converts at most MAX_CAPTURE pieces and fills one empty
+        cell. player moves on the odd plies and the opponent on the even ones.
+        """
+        own_margin = MAX_CAPTURE * (depth // 2)
+        other_margin = MAX_CAPTURE * ((depth + 1) // 2)
+        return (own > own_margin and other > other_margin
+                and board.mobility(player) > own_margin and board.mobility(3 - player) > other_margin
+                and board.empty_count() > depth)
+
+    @staticmethod
+    def _final_score(counts: Tuple[int, int], player: int) -> int:
+        """Score a finished game from player's point of view"""
+        return SearchEngine._result_score(counts[player - 1] - counts[2 - player])
+
+    @staticmethod
+    def _result_score(diff: int) -> int:
+        """Search score of a final piece difference: wins and losses beyond any material score"""
+        if diff > 0:
+            return WIN_SCORE + diff
+        if diff < 0:
+            return -WIN_SCORE + diff
+        return 0
+
+    @staticmethod
+    def _evaluate(board: Board, player: int) -> int:
+        counts = board.get_piece_counts()
+        return counts[player - 1] - counts[2 - player]
@@ -1,5 +1,10 @@
+import time
 from typing import Optional, Tuple
 from .board import Board
+from .book import open_book
+from .engine import SearchEngine
+from .options import DEFAULT_DIFFICULTY, PVC, PVP
+from utils.profiling import profiled
 
 class GameState:
     def __init__(self):
@@ -11,30 +16,53 @@ class GameState:
         self.board = Board()
         self.current_player = 1
         self.time_limit = None
-        self.player1_time = 0
+        self.player1_time = 0  # Seconds left, as of clock_started for the player on move
         self.player2_time = 0
-        self.game_mode = 'pvp'
+        self.clock_started = None  # time.monotonic() when the running clock last started
+        self.game_mode = PVP
+        self.difficulty = DEFAULT_DIFFICULTY
+        self.computer_player = 2
+        self.engine = None
         self.is_game_over = False
         self.winner = None
+        self.timed_out = False  # True if the game ended on time
+        self.level_name = None
+        self.start_position = None  # Board.to_compact() at the start, for game records
         self.selected_piece = None
         self.valid_moves = []
+        self.turn_passed = False  # True when the last move skipped the opponent
+        # Each entry: (undo record, state before the move, state after the move)
+        self.history = []
+        self.redo_stack = []
 
-    def start_new_game(self, level_data: dict, game_mode: str, time_limit: Optional[int]):
+    def start_new_game(self, level_data: dict, game_mode: str, time_limit: Optional[int],
+                       difficulty: str = DEFAULT_DIFFICULTY):
         """Initialize a new game with the given parameters"""
         self.reset_state()  # Reset all state first
         self.board.load_from_json(level_data)
+        self.level_name = level_data.get('name', '')
+        self.start_position = self.board.to_compact()
         self.game_mode = game_mode
+        self.difficulty = difficulty
+        if game_mode == PVC:
+            self.engine = SearchEngine.for_difficulty(difficulty, book=open_book())
         self.time_limit = time_limit
         if time_limit:
             self.player1_time = time_limit * 60
             self.player2_time = time_limit * 60
+            self.clock_started = time.monotonic()
 
+    @profiled
     def make_move(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> list:
         """Execute a move and handle game state changes"""
         if to_pos not in self.valid_moves:
             return []
             
-        converted = self.board.make_move(from_pos, to_pos, self.current_player)
+        self._charge_clock()
+        before = self._turn_state()
+        record = self.board.apply_move(self.board.index(from_pos), self.board.index(to_pos),
+                                       self.current_player)
+        converted = self.board.mask_to_cells(record[3])
         self.selected_piece = None
         self.valid_moves = []
         
@@ -54,25 +82,115 @@ class GameState:
                 # Switch to player 1 if they have moves
                 if p1_has_moves:
                     self.current_player = 1
-                
+            self.turn_passed = self.current_player == before[0]
+
+        self.history.append((record, before, self._turn_state()))
+        self.redo_stack.clear()
+        self._resume_clock()
         return converted
 
-    def update_time(self, dt: float):
-        """Update game timer"""
-        if not self.time_limit or self.is_game_over:
+    def _turn_state(self) -> tuple:
+        """Snapshot of the turn bookkeeping that a move can change"""
+        return self.current_player, self.turn_passed, self.is_game_over, self.winner, self.timed_out
+
+    def _restore_turn_state(self, state: tuple):
+        """Apply a snapshot taken by _turn_state and clear any selection"""
+        self.current_player, self.turn_passed, self.is_game_over, self.winner, self.timed_out = state
+        self.selected_piece = None
+        self.valid_moves = []
+
+    def undo(self) -> bool:
+        """Take back the last move, restoring turn, pass and game-over state"""
+        if not self.history:
+            return False
+        self._charge_clock()
+        entry = self.history.pop()
+        self.board.unmake_move(entry[0])
+        self._restore_turn_state(entry[1])
+        self.redo_stack.append(entry)
+        self._resume_clock()
+        return True
+
+    def redo(self) -> bool:
+        """Replay the most recently undone move"""
+        if not self.redo_stack:
+            return False
+        self._charge_clock()
+        entry = self.redo_stack.pop()
+        record, before, after = entry
+        self.board.apply_move(record[0], record[1], before[0])
+        self._restore_turn_state(after)
+        self.history.append(entry)
+        self._resume_clock()
+        return True
+
+    @property
+    def hash(self) -> int:
+        """64-bit Zobrist key of the placement and side to move"""
+        return self.board.position_key(self.current_player)
+
+    def is_computer_turn(self) -> bool:
+        """Check if the engine should move next"""
+        return (self.game_mode == PVC and not self.is_game_over
+                and self.current_player == self.computer_player)
+
+    def make_computer_move(self) -> Optional[Tuple[Tuple[int, int], Tuple[int, int], list]]:
+        """Let the engine move; returns (from_pos, to_pos, converted) or None"""
+        if not self.is_computer_turn():
+            return None
+        return self.apply_move(self.engine.choose_move(self))
+
+    def apply_move(self, move: Optional[Tuple[Tuple[int, int], Tuple[int, int]]]
+                   ) -> Optional[Tuple[Tuple[int, int], Tuple[int, int], list]]:
+        """Play an engine-chosen (from_pos, to_pos) move; returns (from_pos, to_pos, converted)"""
+        if move is None:
+            return None
+        from_pos, to_pos = move
+        if not self.select_piece(from_pos):
+            return None
+        return from_pos, to_pos, self.make_move(from_pos, to_pos)
+
+    def _charge_clock(self, now: Optional[float] = None):
+        """Bank the running clock's elapsed time against the player on move"""
+        if self.clock_started is None:
             return
-        
+        now = time.monotonic() if now is None else now
         if self.current_player == 1:
-            self.player1_time -= dt
-            if self.player1_time <= 0:
-                self.is_game_over = True
-                self.winner = 2
+            self.player1_time -= now - self.clock_started
         else:
-            self.player2_time -= dt
-            if self.player2_time <= 0:
-                self.is_game_over = True
-                self.winner = 1
+            self.player2_time -= now - self.clock_started
+        self.clock_started = now
+
+    def _resume_clock(self):
+        """Run the clock for the player on move, or stop it once the game is over"""
+        if not self.time_limit or self.is_game_over:
+            self.clock_started = None
+        elif self.clock_started is None:
+            self.clock_started = time.monotonic()
+
+    def remaining_time(self, player: int, now: Optional[float] = None) -> float:
+        """Seconds left on a player's clock, including the running turn"""
+        remaining = self.player1_time if player == 1 else self.player2_time
+        if self.clock_started is not None and player == self.current_player:
+            now = time.monotonic() if now is None else now
+            remaining -= now - self.clock_started
+        return remaining
+
+    def check_timeout(self, now: Optional[float] = None) -> bool:
+        """End the game if the player on move has run out of time; True if it ended"""
+        if not self.time_limit or self.is_game_over or self.clock_started is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if self.remaining_time(self.current_player, now) > 0:
+            return False
+        self.is_game_over = True
+        self.winner = 3 - self.current_player
+        self.timed_out = True
+        self._charge_clock(now)
+        self._resume_clock()
+        return True
 
+    @profiled
     def check_game_over(self):
         """Check if the game has ended"""
         p1_count, p2_count = self.board.get_piece_counts()
@@ -103,10 +221,10 @@ class GameState:
                 
         return p1_has_moves, p2_has_moves
 
+    @profiled
     def select_piece(self, pos: Tuple[int, int]) -> bool:
         """Select a piece and calculate valid moves"""
-        x, y = pos
-        if self.board.board[x][y] == self.current_player:
+        if self.board.get_piece(pos) == self.current_player:
             self.selected_piece = pos
             self.valid_moves = self.board.get_valid_moves(pos)
             return True
@@ -119,6 +237,7 @@ class GameState:
             secs = int(seconds) % 60
             return f"{minutes:02d}:{secs:02d}"
             
-        time1 = format_time(self.player1_time)
-        time2 = format_time(self.player2_time)
+        now = time.monotonic()
+        time1 = format_time(max(0, self.remaining_time(1, now)))
+        time2 = format_time(max(0, self.remaining_time(2, now)))
         return time1, time2
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""Level catalogue: parse and validate level files once, index them, reload on change.
+
+Two file formats are read, detected by their first bytes:
+
+* the JSON list used by ``levels.txt`` (``name``, ``size``, ``board`` and an
+  optional integer ``id`` per level; ids default to the list position), which
+  is parsed and validated in one pass;
+* a compact pack compiled from it, for large catalogues. Its layout
+  (little-endian) is a 16-byte header (magic, version, level count), then one
+  16-byte index record per level (id u32, mask offset u32, name offset u32,
+  rows u8, cols u8, name length u16), then the UTF-8 names, then three
+  bitmasks per level (blockers, player 1, player 2; ``ceil(rows*cols/8)``
+  bytes each, bit index x*cols + y as on Board). Opening a pack reads the
+  index and names only; a level's grid is decoded the first time it is
+  requested.
+
+Either way the file's mtime and size are checked on access and the
+repository reloads itself when they change.
+
+Compile a pack with ``python -m game.level_repository levels.txt --pack assets/levels.pack``.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .board import BLOCKER, EMPTY
+
+MAGIC = b'ATXLVLS\0'
+VERSION = 1
+HEADER = struct.Struct('<8sII')  # magic, version, level count
+INDEX = struct.Struct('<IIIBBH')  # id, mask offset, name offset, rows, cols, name length
+
+# Largest board either format accepts
+MAX_SIZE = 64
+
+DEFAULT_LEVELS_PATH = 'levels.txt'
+
+# Played when no level file can be read
+DEFAULT_LEVEL = {
+    'name': 'Default Level',
+    'size': [7, 7],
+    'board': [
+        [1, 0, 0, 0, 0, 0, 2],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+        [2, 0, 0, 0, 0, 0, 1]
+    ]
+}
+
+CELL_VALUES = (EMPTY, 1, 2, BLOCKER)
+
+
+class LevelError(ValueError):
+    """Raised for a level file or level entry that cannot be used"""
+
+
+def validate_level(data, position: int = 0) -> dict:
+    """Check one level entry and return it as {'id', 'name', 'size', 'board'}"""
+    if not isinstance(data, dict):
+        raise LevelError(f'Level {position} is not an object')
+    name = data.get('name')
+    if not isinstance(name, str) or not name:
+        raise LevelError(f'Level {position} has no name')
+    level_id = data.get('id', position)
+    if not isinstance(level_id, int) or level_id < 0:
+        raise LevelError(f"Level '{name}' has an invalid id")
+    size = data.get('size')
+    if (not isinstance(size, (list, tuple)) or len(size) != 2
+            or not all(isinstance(n, int) and 1 <= n <= MAX_SIZE for n in size)):
+        raise LevelError(f"Level '{name}' has an invalid size")
+    rows, cols = size
+    grid = data.get('board')
+    if (not isinstance(grid, list) or len(grid) != rows
+            or any(not isinstance(row, list) or len(row) != cols for row in grid)):
+        raise LevelError(f"Level '{name}' board does not match its size {rows}x{cols}")
+    if any(value not in CELL_VALUES for row in grid for value in row):
+        raise LevelError(f"Level '{name}' board has a cell that is not one of {CELL_VALUES}")
+    return {'id': level_id, 'name': name, 'size': [rows, cols], 'board': grid}
+
+
+def _grid_masks(level: dict) -> Tuple[int, int, int]:
+    """(blockers, player 1, player 2) bitmasks of a validated level"""
+    cols = level['size'][1]
+    masks = {BLOCKER: 0, 1: 0, 2: 0}
+    for x, row in enumerate(level['board']):
+        for y, value in enumerate(row):
+            if value != EMPTY:
+                masks[value] |= 1 << (x * cols + y)
+    return masks[BLOCKER], masks[1], masks[2]
+
+
+def _grid_from_masks(rows: int, cols: int, blockers: int, player1: int, player2: int) -> List[List[int]]:
+    grid = [[EMPTY] * cols for _ in range(rows)]
+    for value, mask in ((BLOCKER, blockers), (1, player1), (2, player2)):
+        while mask:
+            low = mask & -mask
+            x, y = divmod(low.bit_length() - 1, cols)
+            grid[x][y] = value
+            mask ^= low
+    return grid
+
+
+class LevelRepository:
+    """Levels from one JSON or pack file, indexed by name and id.
+
+    Returned level dicts are shared between callers and must not be modified.
+    """
+
+    def __init__(self, path: str = DEFAULT_LEVELS_PATH):
+        self.path = path
+        self._stamp = None  # (mtime_ns, size) of the loaded file
+        self._map = None  # mmap of a pack file
+        self._names = []
+        self._by_name = {}  # name -> position
+        self._by_id = {}  # id -> position
+        self._index = []  # Pack index records by position
+        self._levels = {}  # position -> decoded level
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[dict]:
+        self._refresh()
+        for position in range(len(self._names)):
+            yield self._level(position)
+
+    def names(self) -> List[str]:
+        """Level names in file order"""
+        self._refresh()
+        return list(self._names)
+
+    def get(self, name: str) -> Optional[dict]:
+        """Level with the given name, or None"""
+        self._refresh()
+        position = self._by_name.get(name)
+        return None if position is None else self._level(position)
+
+    def by_id(self, level_id: int) -> Optional[dict]:
+        """Level with the given id, or None"""
+        self._refresh()
+        position = self._by_id.get(level_id)
+        return None if position is None else self._level(position)
+
+    def _refresh(self):
+        """Load the file on first use and again whenever its mtime or size changes"""
+        stat = os.stat(self.path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        self.close()
+        self._levels = {}
+        self._index = []
+        with open(self.path, 'rb') as f:
+            is_pack = f.read(len(MAGIC)) == MAGIC
+        if is_pack:
+            self._load_pack()
+        else:
+            self._load_json()
+        self._stamp = stamp
+
+    def _load_json(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise LevelError(f'{self.path} is not valid JSON: {e}')
+        if not isinstance(data, list):
+            raise LevelError(f'{self.path} does not contain a list of levels')
+        levels = [validate_level(level, position) for position, level in enumerate(data)]
+        self._set_index([(level['id'], level['name']) for level in levels])
+        self._levels = dict(enumerate(levels))
+
+    def _load_pack(self):
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._map
+        if len(data) < HEADER.size:
+            raise LevelError(f'{self.path} is truncated')
+        _, version, count = HEADER.unpack_from(data, 0)
+        if version != VERSION or HEADER.size + count * INDEX.size > len(data):
+            raise LevelError(f'{self.path} is not a version {VERSION} level pack (or is truncated)')
+        self._index = [INDEX.unpack_from(data, HEADER.size + i * INDEX.size) for i in range(count)]
+        self._set_index([(level_id, data[name_offset:name_offset + name_length].decode('utf-8'))
+                         for level_id, _, name_offset, _, _, name_length in self._index])
+
+    def _set_index(self, entries: List[Tuple[int, str]]):
+        self._names = [name for _, name in entries]
+        self._by_name = {}
+        self._by_id = {}
+        for position, (level_id, name) in enumerate(entries):
+            if name in self._by_name:
+                raise LevelError(f"{self.path} has two levels named '{name}'")
+            if level_id in self._by_id:
+                raise LevelError(f'{self.path} has two levels with id {level_id}')
+            self._by_name[name] = position
+            self._by_id[level_id] = position
+
+    def _level(self, position: int) -> dict:
+        level = self._levels.get(position)
+        if level is None:
+            # Only packs get here: decode the grid on first use
+            level_id, offset, _, rows, cols, _ = self._index[position]
+            width = (rows * cols + 7) // 8
+            masks = [int.from_bytes(self._map[offset + i * width:offset + (i + 1) * width], 'little')
+                     for i in range(3)]
+            level = {'id': level_id, 'name': self._names[position], 'size': [rows, cols],
+                     'board': _grid_from_masks(rows, cols, *masks)}
+            self._levels[position] = level
+        return level
+
+
+@lru_cache(maxsize=4)
+def open_repository(path: str = DEFAULT_LEVELS_PATH) -> LevelRepository:
+    """Shared repository for path; it reloads itself when the file changes"""
+    return LevelRepository(path)
+
+
+def write_pack(path: str, levels: Iterable[dict]) -> int:
+    """Validate levels and write them as a pack; returns the level count
+
+    Written beside path and renamed over it, so a running app keeps its
+    mapping of the old pack until it notices the change.
+    """
+    levels = [validate_level(level, position) for position, level in enumerate(levels)]
+    names = [level['name'].encode('utf-8') for level in levels]
+    names_offset = HEADER.size + len(levels) * INDEX.size
+    masks_offset = names_offset + sum(len(name) for name in names)
+
+    data = bytearray(HEADER.pack(MAGIC, VERSION, len(levels)))
+    name_offset, mask_offset = names_offset, masks_offset
+    mask_data = bytearray()
+    for level, name in zip(levels, names):
+        rows, cols = level['size']
+        data += INDEX.pack(level['id'], mask_offset, name_offset, rows, cols, len(name))
+        width = (rows * cols + 7) // 8
+        for mask in _grid_masks(level):
+            mask_data += mask.to_bytes(width, 'little')
+        name_offset += len(name)
+        mask_offset += 3 * width
+    for name in names:
+        data += name
+    data += mask_data
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(levels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a level file and optionally compile it to a pack')
+    parser.add_argument('levels', nargs='?', default=DEFAULT_LEVELS_PATH)
+    parser.add_argument('--pack', help='write the levels to this pack file')
+    args = parser.parse_args()
+    repository = LevelRepository(args.levels)
+    report: Dict[str, object] = {'levels': len(repository), 'source_bytes': os.path.getsize(args.levels)}
+    if args.pack:
+        report['pack'] = args.pack
+        write_pack(args.pack, repository)
+        report['pack_bytes'] = os.path.getsize(args.pack)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
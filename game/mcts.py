@@ -0,0 +1,298 @@
+"""Monte Carlo tree search (UCT) computer opponent.
+
+Each iteration walks the tree with UCB1, expands one untried move, and
+scores the new leaf with a light playout: uniformly random or
+capture-greedy moves, cut off after ``max_playout_moves`` and scored by
+piece count. Several leaves are collected per batch, with a virtual loss on
+the path so the walks spread out, and their playouts run together. Batches
+of at least NUMPY_MIN_BATCH leaves run on the NumPy BatchBoards simulator;
+smaller ones are played out one at a time on Board, which is faster for
+that few boards. The tree is kept between moves, and the subtree of the
+position actually reached is reused.
+
+Run ``python -m game.mcts --level "Level 4"`` to measure playouts per second.
+"""
+import argparse
+import math
+import random
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from .batch import BatchBoards
+from .benchmarking import load_levels, print_report
+from .board import Board
+from .engine import SearchCancelled
+from .search_common import Move
+
+# UCB1 exploration constant
+EXPLORATION = 1.4
+
+# Visits added along a path while its playout is pending
+VIRTUAL_LOSS = 1
+
+# Playouts that run this long are scored by piece count
+MAX_PLAYOUT_MOVES = 80
+
+# Below this many leaves per batch, per-ply NumPy overhead outweighs the
+# vectorised playouts on 7x7 levels
+NUMPY_MIN_BATCH = 64
+
+PLAYOUT_POLICIES = ('random', 'greedy')
+
+
+class MCTSResult(NamedTuple):
+    move: Optional[Move]  # (from_pos, to_pos), None if the side to move must pass
+    win_rate: float  # Expected result of the move for the searching player, 0 to 1
+    playouts: int  # Playouts run for this move
+    visits: int  # Root visits, including those reused from earlier moves
+    elapsed: float
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.playouts / self.elapsed if self.elapsed else 0.0
+
+
+class Node:
+    """A position in the tree. wins are from the view of the player who moved into it"""
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'wins', 'key', 'winner')
+
+    def __init__(self, move: Optional[Tuple[int, int]], player: int, parent: Optional['Node'],
+                 key: int, winner: Optional[int], moves: List[Tuple[int, int]]):
+        self.move = move  # (from_index, to_index) that led here
+        self.player = player  # Side to move here
+        self.parent = parent
+        self.children = []
+        self.untried = moves
+        self.visits = 0
+        self.wins = 0.0
+        self.key = key
+        self.winner = winner  # Set for finished games: 1, 2 or 0 for a draw
+
+
+def _winner_by_count(board: Board) -> int:
+    p1_count, p2_count = board.get_piece_counts()
+    if p1_count > p2_count:
+        return 1
+    return 2 if p2_count > p1_count else 0
+
+
+class MCTSEngine:
+    """UCT search with light playouts and batched, virtual-loss leaf evaluation.
+
+    The search stops after ``playout_limit`` playouts or ``time_limit``
+    seconds, whichever comes first, and plays the most visited root move.
+    Positions found in the optional opening book are answered without a search.
+    """
+
+    def __init__(self, playout_limit: Optional[int] = 5000, time_limit: Optional[float] = 1.0,
+                 batch_size: int = 1, playout: str = 'greedy',
+                 max_playout_moves: int = MAX_PLAYOUT_MOVES, seed: Optional[int] = None, book=None):
+        if playout not in PLAYOUT_POLICIES:
+            raise ValueError(f"Unknown playout policy '{playout}', expected one of {PLAYOUT_POLICIES}")
+        self.playout_limit = playout_limit
+        self.time_limit = time_limit
+        self.batch_size = max(1, batch_size)
+        self.playout = playout
+        self.max_playout_moves = max_playout_moves
+        self.rng = random.Random(seed)
+        self._np_seed = self.rng.getrandbits(32)
+        self.book = book
+        self.root = None
+
+    def choose_move(self, game_state) -> Optional[Move]:
+        """Pick a move for the current player of a GameState"""
+        return self.search(game_state.board, game_state.current_player).move
+
+    def reset(self):
+        """Forget the tree, e.g. when a new game starts"""
+        self.root = None
+
+    def search(self, board: Board, player: int, stop_event=None) -> MCTSResult:
+        """Search the position with `player` to move within the budget"""
+        start = time.perf_counter()
+        if not board.has_valid_moves(player):
+            return MCTSResult(None, 0.0, 0, 0, 0.0)
+        if self.book is not None:
+            entry = self.book.lookup(board, player)
+            if entry is not None:
+                return MCTSResult((board.position(entry.from_index), board.position(entry.to_index)),
+                                  0.0, 0, 0, time.perf_counter() - start)
+        root = self._find_root(board, player)
+        board = board.copy()
+        playouts = 0
+
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                raise SearchCancelled()
+            if self.playout_limit is not None and playouts >= self.playout_limit:
+                break
+            if self.time_limit is not None and time.perf_counter() - start >= self.time_limit:
+                break
+            if not root.untried and len(root.children) == 1:
+                break  # Only one move, nothing to decide
+            batch = self.batch_size
+            if self.playout_limit is not None:
+                batch = min(batch, self.playout_limit - playouts)
+            playouts += self._run_batch(root, board, batch)
+
+        best = max(root.children, key=lambda child: child.visits)
+        win_rate = best.wins / best.visits if best.visits else 0.0
+        move = (board.position(best.move[0]), board.position(best.move[1]))
+        return MCTSResult(move, win_rate, playouts, root.visits, time.perf_counter() - start)
+
+    def _find_root(self, board: Board, player: int) -> Node:
+        """Reuse the node for this position from the last tree, else start a new tree"""
+        key = board.position_key(player)
+        if self.root is not None:
+            # The position is usually the old root or two plies below it
+            frontier = [self.root]
+            for _ in range(3):
+                for node in frontier:
+                    if node.key == key and node.player == player:
+                        node.parent = None
+                        self.root = node
+                        return node
+                frontier = [child for node in frontier for child in node.children]
+        self.root = self._new_node(board, None, player, None)
+        return self.root
+
+    def _new_node(self, board: Board, move, player: int, parent: Optional[Node]) -> Node:
+        winner = None
+        moves = []
+        if player == 0:
+            winner = _winner_by_count(board)
+        else:
+            moves = board.generate_moves(player)
+            self.rng.shuffle(moves)
+        return Node(move, player, parent, board.position_key(player), winner, moves)
+
+    def _run_batch(self, root: Node, board: Board, size: int) -> int:
+        """Select and expand size leaves, play them out together and back up
+
+        Finished games are scored directly and still count as playouts.
+        """
+        paths = []
+        leaves = []  # (board copy, side to move) for leaves that need a playout
+        results = []  # Winner per path; None until its playout finishes
+        for _ in range(size):
+            node = root
+            path = [node]
+            records = []
+            node.visits += VIRTUAL_LOSS
+            # Selection
+            while not node.untried and node.children:
+                node = self._select_child(node)
+                records.append(board.apply_move(node.move[0], node.move[1], node.parent.player))
+                node.visits += VIRTUAL_LOSS
+                path.append(node)
+            # Expansion
+            if node.untried:
+                from_index, to_index = node.untried.pop()
+                mover = node.player
+                records.append(board.apply_move(from_index, to_index, mover))
+                child = self._new_node(board, (from_index, to_index), board.next_player(mover), node)
+                node.children.append(child)
+                node = child
+                node.visits += VIRTUAL_LOSS
+                path.append(node)
+            if node.winner is not None:
+                results.append(node.winner)
+            else:
+                results.append(None)
+                leaves.append((len(paths), board.copy(), node.player))
+            paths.append(path)
+            for record in reversed(records):
+                board.unmake_move(record)
+
+        for (i, _, _), winner in zip(leaves, self._play_out([(b, p) for _, b, p in leaves])):
+            results[i] = winner
+        for path, winner in zip(paths, results):
+            self._backup(path, winner)
+        return len(paths)
+
+    def _select_child(self, node: Node) -> Node:
+        log_visits = math.log(node.visits)
+        best, best_value = None, -1.0
+        for child in node.children:
+            value = child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    @staticmethod
+    def _backup(path: List[Node], winner: int):
+        """Replace the virtual loss with a real visit and credit the result"""
+        for node in path:
+            node.visits += 1 - VIRTUAL_LOSS
+            if node.parent is not None:
+                mover = node.parent.player
+                if winner == mover:
+                    node.wins += 1.0
+                elif winner == 0:
+                    node.wins += 0.5
+
+    def _play_out(self, leaves: List[Tuple[Board, int]]) -> List[int]:
+        """Winner of a light playout from each (board, side to move)"""
+        if len(leaves) < NUMPY_MIN_BATCH:
+            return [self._play_out_one(board, player) for board, player in leaves]
+        batch = BatchBoards.from_boards([b for b, _ in leaves], [p for _, p in leaves], seed=self._np_seed)
+        self._np_seed += 1
+        batch.play_out(self.playout, self.max_playout_moves)
+        counts = batch.piece_counts()
+        winners = []
+        for winner, (p1_count, p2_count) in zip(batch.winner.tolist(), counts.tolist()):
+            if winner < 0:  # Cut off: score by piece count
+                winner = 1 if p1_count > p2_count else 2 if p2_count > p1_count else 0
+            winners.append(winner)
+        return winners
+
+    def _play_out_one(self, board: Board, player: int) -> int:
+        rng = self.rng
+        greedy = self.playout == 'greedy'
+        for _ in range(self.max_playout_moves):
+            if greedy:
+                moves, gains = board.generate_scored_moves(player)
+                best = max(gains)
+                from_index, to_index = rng.choice([m for m, g in zip(moves, gains) if g == best])
+            else:
+                from_index, to_index = rng.choice(board.generate_moves(player))
+            board.apply_move(from_index, to_index, player)
+            player = board.next_player(player)
+            if player == 0:
+                break
+        return _winner_by_count(board)
+
+
+def benchmark(levels_path: str, level_name: Optional[str], playouts: int, batch_sizes: List[int],
+              playout: str) -> dict:
+    """Time one search from the start of a level per batch size"""
+    levels = load_levels(levels_path)
+    level = next((lv for lv in levels if lv['name'] == level_name), levels[0])
+    board = Board()
+    board.load_from_json(level)
+    report = {'level': level['name'], 'playout': playout, 'runs': []}
+    for batch_size in batch_sizes:
+        engine = MCTSEngine(playout_limit=playouts, time_limit=None, batch_size=batch_size,
+                            playout=playout, seed=1)
+        result = engine.search(board, 1)
+        report['runs'].append({'batch_size': batch_size, 'playouts': result.playouts,
+                               'seconds': round(result.elapsed, 3),
+                               'playouts_per_second': round(result.playouts_per_second),
+                               'move': result.move, 'win_rate': round(result.win_rate, 3)})
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark MCTS playout throughput')
+    parser.add_argument('--levels', default='levels.txt')
+    parser.add_argument('--level', help='level name (default: the first level)')
+    parser.add_argument('--playouts', type=int, default=2000)
+    parser.add_argument('--batch-sizes', default='1,16,256', help='comma-separated batch sizes')
+    parser.add_argument('--playout', choices=PLAYOUT_POLICIES, default='greedy')
+    args = parser.parse_args()
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    print_report(benchmark(args.levels, args.level, args.playouts, batch_sizes, args.playout))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+"""Game settings offered on the start screen.
+
+Kept free of imports so the start screen can list them without loading
+the engine.
+"""
+
+# Game modes
+PVP = 'pvp'
+PVC = 'pvc'  # Player 1 is human, player 2 is the computer
+
+# Search budgets per difficulty, passed to SearchEngine; use_book (default
+# True) lets the engine play opening-book moves
+DIFFICULTY_LEVELS = {
+    'Easy': {'max_depth': 1, 'time_limit': 0.25, 'use_book': False, 'endgame_empties': 0},
+    'Medium': {'max_depth': 3, 'time_limit': 0.5},
+    'Hard': {'max_depth': 64, 'time_limit': 1.0},
+}
+DEFAULT_DIFFICULTY = 'Medium'
@@ -0,0 +1,228 @@
+"""Parallel root-split search across a multiprocessing pool.
+
+Each iteration searches the first (best-ordered) root move to get a bound,
+then scores the remaining root moves in parallel with a null window against
+that bound, re-searching only those that beat it. Positions cross the
+process boundary as Board.to_compact() tuples, and every worker keeps its
+own SearchEngine so its transposition table persists across tasks.
+
+Run ``python -m game.parallel --workers 8`` to compare nodes per second and
+wall-clock speedup against a single worker.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from itertools import islice
+from typing import List, Optional, Tuple
+
+from .benchmarking import load_levels, print_report, random_playout
+from .board import Board
+from .engine import INFINITY, WIN_SCORE, SearchEngine, SearchResult, SearchTimeout
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+_worker_engine = None
+_worker_search = None  # Search id of the last task the worker ran
+
+
+def _init_worker(tt_size_mb: float):
+    global _worker_engine
+    _worker_engine = SearchEngine(tt_size_mb=tt_size_mb)
+
+
+def _score_root_move(task) -> Tuple[Optional[int], int]:
+    """Score one root move in a worker; returns (score or None on timeout, nodes)
+
+    deadline is a time.time() value shared by every task of the search, so
+    a task that waited in the queue gets only what is left of the budget.
+    The worker's table is aged once per search_id, not once per task.
+    """
+    global _worker_search
+    search_id, compact, player, move, depth, alpha, beta, deadline, node_limit = task
+    time_limit = None
+    if deadline is not None:
+        time_limit = deadline - time.time()
+        if time_limit <= 0:
+            return None, 0
+    board = Board.from_compact(compact)
+    board.apply_move(move[0], move[1], player)
+    _worker_engine.node_limit = node_limit
+    new_search = search_id != _worker_search
+    _worker_search = search_id
+    try:
+        score = -_worker_engine.score_position(board, 3 - player, depth, -beta, -alpha, time_limit,
+                                               new_search)
+    except SearchTimeout:
+        return None, _worker_engine.nodes
+    return score, _worker_engine.nodes
+
+
+class ParallelSearchEngine:
+    """Iterative-deepening root-split search over `workers` processes.
+
+    Takes the same budget settings and opening book as SearchEngine and
+    returns the same SearchResult. The time limit is one deadline shared by
+    all workers; the nodes left of node_limit are split evenly between the
+    tasks of each pass, so the search as a whole stays within it.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_depth: int = 64,
+                 time_limit: Optional[float] = 1.0, node_limit: Optional[int] = None,
+                 tt_size_mb: float = 16, book=None):
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.tt_size_mb = tt_size_mb
+        self.book = book
+        self.nodes = 0
+        self._search_id = 0  # Sent with every task so workers age their tables once per search
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers, initializer=_init_worker,
+                                              initargs=(self.tt_size_mb,))
+        return self._pool
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def choose_move(self, game_state):
+        """Pick a move for the current player of a GameState"""
+        return self.search(game_state.board, game_state.current_player).move
+
+    def search(self, board: Board, player: int) -> SearchResult:
+        """Search the position with `player` to move within the budget"""
+        start = time.perf_counter()
+        self.nodes = 0
+        self._search_id += 1
+        if self.book is not None:
+            entry = self.book.lookup(board, player)
+            if entry is not None:
+                return SearchResult((board.position(entry.from_index), board.position(entry.to_index)),
+                                    entry.score, 0, 0, time.perf_counter() - start)
+        moves, gains = board.generate_scored_moves(player)
+        if not moves:
+            return SearchResult(None, 0, 0, 0, 0.0)
+        moves = [move for _, move in sorted(zip(gains, moves), key=lambda pair: -pair[0])]
+
+        pool = self._get_pool()
+        compact = board.to_compact()
+        best_move, best_score, completed = moves[0], -INFINITY, 0
+        deadline = time.time() + self.time_limit if self.time_limit else None
+
+        for depth in range(1, self.max_depth + 1):
+            if deadline is not None and time.time() >= deadline:
+                break
+            scores = self._search_depth(pool, compact, player, moves, depth - 1, deadline)
+            if scores is None:
+                break  # Ran out of budget part way through this depth
+            # Best move first for the next iteration
+            order = sorted(range(len(moves)), key=scores.__getitem__, reverse=True)
+            moves = [moves[i] for i in order]
+            best_move, best_score, completed = moves[0], scores[order[0]], depth
+            if abs(best_score) >= WIN_SCORE or len(moves) == 1:
+                break
+
+        elapsed = time.perf_counter() - start
+        return SearchResult((board.position(best_move[0]), board.position(best_move[1])),
+                            best_score, completed, self.nodes, elapsed)
+
+    def _node_share(self, tasks: int) -> Optional[int]:
+        """Node limit for each of `tasks` tasks from what is left of node_limit"""
+        if self.node_limit is None:
+            return None
+        return max(0, self.node_limit - self.nodes) // tasks
+
+    def _search_depth(self, pool, compact, player, moves, depth, deadline) -> Optional[List[int]]:
+        """Score every root move at depth; None if the time or node budget ran out"""
+        node_limit = self._node_share(1)
+        if node_limit == 0:
+            return None
+        task = (self._search_id, compact, player, moves[0], depth, -INFINITY, INFINITY, deadline, node_limit)
+        score, nodes = pool.apply(_score_root_move, (task,))
+        self.nodes += nodes
+        if score is None:
+            return None
+        alpha = score
+        scores = [score]
+
+        # Null-window pass: only moves that beat the first need an exact score
+        if len(moves) > 1:
+            node_limit = self._node_share(len(moves) - 1)
+            if node_limit == 0:
+                return None
+            tasks = [(self._search_id, compact, player, move, depth, alpha, alpha + 1, deadline, node_limit)
+                     for move in moves[1:]]
+            results = pool.map(_score_root_move, tasks, chunksize=1)
+            self.nodes += sum(nodes for _, nodes in results)
+            if any(score is None for score, _ in results):
+                return None
+            scores.extend(score for score, _ in results)
+
+        better = [i for i in range(1, len(moves)) if scores[i] > alpha]
+        if better:
+            node_limit = self._node_share(len(better))
+            if node_limit == 0:
+                return None
+            tasks = [(self._search_id, compact, player, moves[i], depth, alpha, INFINITY, deadline, node_limit)
+                     for i in better]
+            results = pool.map(_score_root_move, tasks, chunksize=1)
+            self.nodes += sum(nodes for _, nodes in results)
+            if any(score is None for score, _ in results):
+                return None
+            for i, (score, _) in zip(better, results):
+                scores[i] = score
+        return scores
+
+
+def _sample_positions(levels: List[dict], plies: int, seed: int) -> List[Tuple[Board, int]]:
+    """One position per level after `plies` random moves, or the last before the game ended"""
+    rng = random.Random(seed)
+    return [list(islice(random_playout(level, rng), plies + 1))[-1] for level in levels]
+
+
+def benchmark(levels_path: str, workers: int, depth: int, plies: int = 12, seed: int = 1) -> dict:
+    """Search sample positions at a fixed depth with 1 and `workers` processes"""
+    positions = _sample_positions(load_levels(levels_path), plies, seed)
+    report = {'depth': depth, 'positions': len(positions)}
+    for label, count in (('single', 1), ('parallel', workers)):
+        with ParallelSearchEngine(workers=count, max_depth=depth, time_limit=None) as engine:
+            nodes = 0
+            elapsed = 0.0
+            for board, player in positions:
+                result = engine.search(board, player)
+                nodes += result.nodes
+                elapsed += result.elapsed
+        report[label] = {'workers': count, 'nodes': nodes, 'seconds': round(elapsed, 3),
+                         'nps': round(nodes / elapsed) if elapsed else 0}
+    single, parallel = report['single']['seconds'], report['parallel']['seconds']
+    report['speedup'] = round(single / parallel, 2) if parallel else None
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel root-split search')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--plies', type=int, default=12, help='random opening moves per sample position')
+    parser.add_argument('--levels', default='levels.txt')
+    args = parser.parse_args()
+    print_report(benchmark(args.levels, args.workers, args.depth, args.plies))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Computer players for headless games.
+
+Every player has choose_move(game_state) returning a (from_pos, to_pos)
+move for the current player, or None if that player has no move.
+"""
+import random
+from typing import Optional
+
+from .engine import SearchEngine
+from .mcts import MCTSEngine
+from .search_common import Move
+
+
+class RandomPlayer:
+    """Plays a uniformly random legal move"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def choose_move(self, game_state) -> Optional[Move]:
+        moves = game_state.board.get_all_moves(game_state.current_player)
+        return self.rng.choice(moves) if moves else None
+
+
+class GreedyPlayer:
+    """Plays the move with the biggest immediate piece swing, breaking ties randomly"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def choose_move(self, game_state) -> Optional[Move]:
+        board = game_state.board
+        moves, gains = board.generate_scored_moves(game_state.current_player)
+        if not moves:
+            return None
+        best = max(gains)
+        from_index, to_index = self.rng.choice([move for move, gain in zip(moves, gains) if gain == best])
+        return board.position(from_index), board.position(to_index)
+
+
+class SearchPlayer:
+    """Plays the alpha-beta engine's choice at a fixed depth"""
+
+    def __init__(self, depth: int):
+        self.engine = SearchEngine(max_depth=depth, time_limit=None)
+
+    def choose_move(self, game_state) -> Optional[Move]:
+        return self.engine.choose_move(game_state)
+
+
+class MCTSPlayer:
+    """Plays the Monte Carlo tree search choice with a fixed playout budget"""
+
+    def __init__(self, playouts: int, seed: Optional[int] = None):
+        self.engine = MCTSEngine(playout_limit=playouts, time_limit=None, seed=seed)
+
+    def choose_move(self, game_state) -> Optional[Move]:
+        return self.engine.choose_move(game_state)
+
+
+def create_player(spec: str, seed: Optional[int] = None):
+    """Build a player from 'random', 'greedy', 'search:<depth>' or 'mcts:<playouts>'"""
+    name, _, arg = spec.partition(':')
+    if name == 'random':
+        return RandomPlayer(seed)
+    if name == 'greedy':
+        return GreedyPlayer(seed)
+    if name == 'search':
+        return SearchPlayer(int(arg or 3))
+    if name == 'mcts':
+        return MCTSPlayer(int(arg or 1000), seed)
+    raise ValueError(f"Unknown player '{spec}', expected random, greedy, search:<depth> or mcts:<playouts>")
@@ -0,0 +1,318 @@
+"""Compact game records: an append-only file of finished games.
+
+File layout (little-endian): a 10-byte file header (magic, version), then
+one record per game: a record header (RECORD_MAGIC, body length u32, CRC-32
+of the body u32), then the body: a fixed game header (timestamp f64,
+time limit in minutes u16 with 0 for unlimited, game mode u8, winner u8,
+end reason u8, rows u8, cols u8, level name length u8, move count u32),
+the UTF-8 level name, the starting position as three bitmasks (blockers,
+player 1, player 2; ``ceil(rows*cols/8)`` bytes each, bit index
+x*cols + y as on Board), then the moves.
+
+A move is stored as ``to_index * 24 + offset`` where offset indexes
+MOVE_OFFSETS, the (dx, dy) from destination back to origin. That is two
+bytes per move for boards of up to 2730 cells and three bytes beyond.
+Passes are not stored: the side to move follows from the position, as in
+Board.next_player.
+
+Records are appended as games finish and read back one at a time, so a
+file of millions of games is replayed without loading it whole. A record
+cut short by a crash is followed by the records written after it; the
+reader skips it by searching for the next RECORD_MAGIC whose record passes
+its checksum. Run ``python -m game.records games.atxg`` to replay and
+verify a file.
+"""
+import argparse
+import json
+import os
+import struct
+import time
+import zlib
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
+
+from .board import Board
+from .options import PVC, PVP
+
+MAGIC = b'ATXGAMES'
+VERSION = 2
+FILE_HEADER = struct.Struct('<8sH')  # magic, version
+RECORD_MAGIC = b'ATXR'
+RECORD_HEADER = struct.Struct('<4sII')  # record magic, body length, CRC-32 of the body
+MAX_BODY_BYTES = 1 << 24  # Longer lengths can only come from a damaged record
+SCAN_CHUNK = 1 << 16  # Bytes read at a time when searching for the next record
+MOVE_CODE = struct.Struct('<H')
+GAME_HEADER = struct.Struct('<dHBBBBBBI')  # timestamp, time limit, mode, winner, reason, rows, cols, name length, moves
+
+# Where the app appends finished games, relative to the working directory like levels.txt
+DEFAULT_RECORDS_PATH = 'games.atxg'
+
+# Destination-to-origin offsets; clones first, then jumps
+MOVE_OFFSETS = tuple((dx, dy) for dx in range(-1, 2) for dy in range(-1, 2) if dx or dy) + \
+    tuple((dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if max(abs(dx), abs(dy)) == 2)
+_OFFSET_CODES = {offset: code for code, offset in enumerate(MOVE_OFFSETS)}
+
+# Game modes by stored code
+GAME_MODES = (PVP, PVC)
+
+# Winner value for a game that was abandoned before it ended
+NO_WINNER = 255
+
+# End reasons
+END_NORMAL = 0  # A side ran out of pieces or neither side can move
+END_TIMEOUT = 1  # The side to move ran out of time
+END_ABANDONED = 2  # Left before the end
+
+
+class RecordError(ValueError):
+    """Raised for a records file or game record that cannot be read or replayed"""
+
+
+def move_width(cells: int) -> int:
+    """Bytes per stored move on a board with this many cells"""
+    return 2 if cells * len(MOVE_OFFSETS) <= 1 << 16 else 3
+
+
+class GameRecord(NamedTuple):
+    timestamp: float  # Seconds since the epoch when the game ended
+    level_name: str
+    size: Tuple[int, int]
+    blockers: int
+    player1: int  # Starting pieces of player 1
+    player2: int
+    time_limit: Optional[int]  # Minutes per player, None for unlimited
+    game_mode: str
+    winner: int  # 1, 2, 0 for a draw or NO_WINNER
+    reason: int  # END_NORMAL, END_TIMEOUT or END_ABANDONED
+    move_data: bytes
+
+    @property
+    def move_count(self) -> int:
+        return len(self.move_data) // move_width(self.size[0] * self.size[1])
+
+    def start_board(self) -> Board:
+        return Board.from_compact((self.size[0], self.size[1], self.blockers, self.player1, self.player2))
+
+    def moves(self) -> Iterator[Tuple[int, int]]:
+        """(from_index, to_index) of every move in order"""
+        cols = self.size[1]
+        count = len(MOVE_OFFSETS)
+        data = self.move_data
+        if move_width(self.size[0] * cols) == 2:
+            codes = (code for (code,) in MOVE_CODE.iter_unpack(data))
+        else:
+            codes = (int.from_bytes(data[i:i + 3], 'little') for i in range(0, len(data), 3))
+        for code in codes:
+            to_index, offset = divmod(code, count)
+            dx, dy = MOVE_OFFSETS[offset]
+            yield to_index + dx * cols + dy, to_index
+
+
+def encode_moves(size: Tuple[int, int], moves) -> bytes:
+    """Pack (from_index, to_index) moves for a board of size (rows, cols)"""
+    cols = size[1]
+    width = move_width(size[0] * cols)
+    data = bytearray()
+    for from_index, to_index in moves:
+        fx, fy = divmod(from_index, cols)
+        tx, ty = divmod(to_index, cols)
+        code = to_index * len(MOVE_OFFSETS) + _OFFSET_CODES[(fx - tx, fy - ty)]
+        data += code.to_bytes(width, 'little')
+    return bytes(data)
+
+
+def record_game(game_state, timestamp: Optional[float] = None) -> GameRecord:
+    """Record of the moves played in a GameState since its game started"""
+    rows, cols, blockers, player1, player2 = game_state.start_position
+    if not game_state.is_game_over:
+        winner, reason = NO_WINNER, END_ABANDONED
+    else:
+        winner = game_state.winner
+        reason = END_TIMEOUT if game_state.timed_out else END_NORMAL
+    return GameRecord(time.time() if timestamp is None else timestamp, game_state.level_name,
+                      (rows, cols), blockers, player1, player2, game_state.time_limit or None,
+                      game_state.game_mode, winner, reason,
+                      encode_moves((rows, cols), ((entry[0][0], entry[0][1]) for entry in game_state.history)))
+
+
+def _write_record(f: BinaryIO, record: GameRecord):
+    rows, cols = record.size
+    name = record.level_name.encode('utf-8')[:255]
+    width = (rows * cols + 7) // 8
+    body = bytearray(GAME_HEADER.pack(record.timestamp, record.time_limit or 0,
+                                      GAME_MODES.index(record.game_mode), record.winner, record.reason,
+                                      rows, cols, len(name), record.move_count))
+    body += name
+    for mask in (record.blockers, record.player1, record.player2):
+        body += mask.to_bytes(width, 'little')
+    body += record.move_data
+    f.write(RECORD_HEADER.pack(RECORD_MAGIC, len(body), zlib.crc32(body)) + body)
+
+
+class GameWriter:
+    """Appends records to a file, writing the file header if it is new
+
+    Each record is flushed and synced to disk as it is written, so a crash
+    loses at most the game being written. Use as a context manager or call
+    close(). Raises RecordError if the file has another format.
+    """
+
+    def __init__(self, path: str = DEFAULT_RECORDS_PATH):
+        self._file = open(path, 'a+b')
+        self._file.seek(0)
+        header = self._file.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            # New, or a crash cut the file header short: start over
+            self._file.truncate(0)
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+            self._sync()
+        elif FILE_HEADER.unpack(header) != (MAGIC, VERSION):
+            self._file.close()
+            raise RecordError(f'{path} is not a version {VERSION} game records file')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, record: GameRecord):
+        _write_record(self._file, record)
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def append_game(path: str, record: GameRecord):
+    """Append one record, creating the file if needed"""
+    with GameWriter(path) as writer:
+        writer.write(record)
+
+
+def _find_record(f: BinaryIO, offset: int) -> Optional[int]:
+    """Offset of the next RECORD_MAGIC at or after offset, or None"""
+    overlap = len(RECORD_MAGIC) - 1
+    while True:
+        f.seek(offset)
+        chunk = f.read(SCAN_CHUNK)
+        found = chunk.find(RECORD_MAGIC)
+        if found >= 0:
+            return offset + found
+        if len(chunk) < SCAN_CHUNK:
+            return None
+        offset += len(chunk) - overlap
+
+
+def _parse_record(path: str, body: bytes) -> GameRecord:
+    if len(body) < GAME_HEADER.size:
+        raise RecordError(f'{path} has a record too short for its header')
+    (timestamp, time_limit, mode, winner, reason, rows, cols, name_length,
+     move_count) = GAME_HEADER.unpack_from(body)
+    width = (rows * cols + 7) // 8
+    offset = GAME_HEADER.size + name_length
+    masks = [int.from_bytes(body[offset + i * width:offset + (i + 1) * width], 'little')
+             for i in range(3)]
+    move_data = body[offset + 3 * width:]
+    if len(move_data) != move_count * move_width(rows * cols):
+        raise RecordError(f'{path} has a record whose move count does not match its moves')
+    return GameRecord(timestamp, body[GAME_HEADER.size:offset].decode('utf-8'), (rows, cols),
+                      masks[0], masks[1], masks[2], time_limit or None, GAME_MODES[mode],
+                      winner, reason, move_data)
+
+
+def read_games(path: str, on_damage=None) -> Iterator[GameRecord]:
+    """Yield every record in a file, reading one game at a time
+
+    Damaged bytes, such as a record cut short by a crash, are skipped up
+    to the next record that passes its checksum; on_damage(offset, length)
+    is called for each skipped span.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            raise RecordError(f'{path} is not a game records file')
+        magic, version = FILE_HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise RecordError(f'{path} is not a version {VERSION} game records file')
+        offset = FILE_HEADER.size
+        while True:
+            f.seek(offset)
+            prefix = f.read(RECORD_HEADER.size)
+            if not prefix:
+                return
+            body = None
+            if len(prefix) == RECORD_HEADER.size:
+                record_magic, length, checksum = RECORD_HEADER.unpack(prefix)
+                if record_magic == RECORD_MAGIC and length <= MAX_BODY_BYTES:
+                    body = f.read(length)
+                    if len(body) != length or zlib.crc32(body) != checksum:
+                        body = None
+            if body is not None:
+                yield _parse_record(path, body)
+                offset += RECORD_HEADER.size + length
+                continue
+            next_offset = _find_record(f, offset + 1)
+            if on_damage is not None:
+                end = next_offset if next_offset is not None else f.seek(0, os.SEEK_END)
+                on_damage(offset, end - offset)
+            if next_offset is None:
+                return
+            offset = next_offset
+
+
+def replay(record: GameRecord) -> Board:
+    """Play a record through the rules and return the final board
+
+    Raises RecordError if a move is illegal for the side to move, or if a
+    normally finished game does not end with the recorded winner.
+    """
+    board = record.start_board()
+    layout = board.layout
+    player = 1
+    for n, (from_index, to_index) in enumerate(record.moves()):
+        if (player == 0 or not 0 <= from_index < layout.cells or to_index >= layout.cells
+                or not layout.reach_masks[from_index] >> to_index & 1
+                or board.get_piece(board.position(from_index)) != player
+                or board.get_piece(board.position(to_index)) != 0):
+            raise RecordError(f'Move {n + 1} of the record is not legal')
+        board.apply_move(from_index, to_index, player)
+        player = board.next_player(player)
+    if record.reason == END_NORMAL:
+        p1_count, p2_count = board.get_piece_counts()
+        expected = 1 if p1_count > p2_count else 2 if p2_count > p1_count else 0
+        if player != 0 or record.winner != expected:
+            raise RecordError('The record does not end with its recorded result')
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay and verify a game records file')
+    parser.add_argument('path', nargs='?', default=DEFAULT_RECORDS_PATH)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    games = moves = 0
+    winners = {'1': 0, '2': 0, 'draw': 0, 'none': 0}
+    damaged = []
+
+    def on_damage(offset, length):
+        damaged.append({'offset': offset, 'bytes': length})
+
+    for record in read_games(args.path, on_damage):
+        replay(record)
+        games += 1
+        moves += record.move_count
+        winners[{1: '1', 2: '2', 0: 'draw'}.get(record.winner, 'none')] += 1
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'games': games, 'moves': moves, 'winners': winners,
+                      'file_bytes': os.path.getsize(args.path), 'damaged': damaged,
+                      'seconds': round(elapsed, 3),
+                      'games_per_second': round(games / elapsed) if elapsed else None,
+                      'moves_per_second': round(moves / elapsed) if elapsed else None}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Pieces shared by the alpha-beta searches: budget checks and move ordering."""
+import time
+from typing import List, Optional, Tuple
+
+from .board import Board
+from .transposition import EXACT, LOWER, UPPER
+
+# How many nodes to search between budget checks
+CHECK_INTERVAL = 1024
+
+Move = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+class SearchBudget:
+    """Time, node and stop-event limits of one search.
+
+    Searches compare their node count with next_check on every node and
+    call check() once it is reached, which raises `error` if the budget is
+    used up.
+    """
+
+    def __init__(self, error):
+        self.error = error
+        self.deadline = None
+        self.node_limit = None
+        self.stop_event = None
+        self.next_check = CHECK_INTERVAL
+
+    def start(self, deadline: Optional[float], node_limit: Optional[int] = None, stop_event=None):
+        """Begin a search ending at the time.perf_counter() deadline, if any"""
+        self.deadline = deadline
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        # A node limit below the check interval is still honoured
+        self.next_check = min(CHECK_INTERVAL, node_limit or CHECK_INTERVAL)
+
+    def check(self, nodes: int):
+        self.next_check = nodes + CHECK_INTERVAL
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise self.error()
+        if self.node_limit is not None and nodes >= self.node_limit:
+            raise self.error()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise self.error()
+
+
+def order_moves(moves: List[Tuple[int, int]], gains: List[int], tt_move: Optional[Tuple[int, int]],
+                history: Optional[dict] = None) -> List[int]:
+    """Return move indices: table move first, then by capture count, then by history of cutoffs
+
+    Board.generate_scored_moves lists clones first, so they stay ahead of
+    jumps with the same captures.
+    """
+    if history:
+        keys = [(gain, history.get(move, 0)) for gain, move in zip(gains, moves)]
+        order = sorted(range(len(moves)), key=keys.__getitem__, reverse=True)
+    else:
+        order = sorted(range(len(moves)), key=gains.__getitem__, reverse=True)
+    if tt_move is not None and tt_move in moves:
+        first = moves.index(tt_move)
+        order.remove(first)
+        order.insert(0, first)
+    return order
+
+
+def ordered_moves(board: Board, player: int, tt_move: Optional[Tuple[int, int]],
+                  history: Optional[dict] = None) -> List[Tuple[int, int]]:
+    """Legal (from_index, to_index) moves of player in search order"""
+    moves, gains = board.generate_scored_moves(player)
+    return [moves[i] for i in order_moves(moves, gains, tt_move, history)]
+
+
+def table_cutoff(flag: int, score: int, alpha: int, beta: int) -> bool:
+    """Whether a stored score of this bound type settles a node searched with (alpha, beta)"""
+    return flag == EXACT or (flag == LOWER and score >= beta) or (flag == UPPER and score <= alpha)
+
+
+def bound_flag(score: int, original_alpha: int, beta: int) -> int:
+    """Bound type of a node's best score for the table"""
+    if score <= original_alpha:
+        return UPPER
+    if score >= beta:
+        return LOWER
+    return EXACT
@@ -0,0 +1,111 @@
+"""Headless self-play runner.
+
+Plays games per level from levels.txt between configurable players and
+streams one JSON object per finished game to stdout (or --output):
+
+    python -m game.tournament --games 100 --p1 greedy --p2 search:2
+
+Games run in a multiprocessing pool, one process per core by default. This
+module and everything it imports stays free of Kivy.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterator, List
+
+from .game_state import GameState
+from .players import create_player
+
+DEFAULT_MAX_MOVES = 1000
+
+
+def play_game(level: dict, p1_spec: str, p2_spec: str, seed: int,
+              max_moves: int = DEFAULT_MAX_MOVES) -> dict:
+    """Play one game through GameState and return its result record"""
+    start = time.perf_counter()
+    players = {1: create_player(p1_spec, seed), 2: create_player(p2_spec, seed + 1)}
+    state = GameState()
+    state.start_new_game(level, 'pvp', None)
+
+    moves = 0
+    while not state.is_game_over and moves < max_moves:
+        move = players[state.current_player].choose_move(state)
+        if move is None or state.apply_move(move) is None:
+            raise RuntimeError(f"Player {state.current_player} produced no legal move: {move}")
+        moves += 1
+
+    p1_count, p2_count = state.board.get_piece_counts()
+    winner = state.winner
+    if not state.is_game_over:
+        winner = 1 if p1_count > p2_count else 2 if p2_count > p1_count else 0
+    return {
+        'level': level.get('name'),
+        'seed': seed,
+        'p1': p1_spec,
+        'p2': p2_spec,
+        'winner': winner,
+        'p1_count': p1_count,
+        'p2_count': p2_count,
+        'moves': moves,
+        'truncated': not state.is_game_over,
+        'seconds': round(time.perf_counter() - start, 6),
+    }
+
+
+def _play_task(task) -> dict:
+    return play_game(*task)
+
+
+def run_tournament(levels: List[dict], games: int, p1_spec: str, p2_spec: str,
+                   workers: int = 0, seed: int = 0, max_moves: int = DEFAULT_MAX_MOVES) -> Iterator[dict]:
+    """Yield game records as they finish; workers=0 uses every core"""
+    tasks = [(level, p1_spec, p2_spec, seed + 2 * (n * len(levels) + i), max_moves)
+             for n in range(games) for i, level in enumerate(levels)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            yield _play_task(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        chunksize = max(1, len(tasks) // (workers * 16))
+        yield from pool.imap_unordered(_play_task, tasks, chunksize=chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run headless Ataxx games over levels.txt')
+    parser.add_argument('--levels', default='levels.txt')
+    parser.add_argument('--level', action='append', help='only play levels with this name (repeatable)')
+    parser.add_argument('--games', type=int, default=10, help='games per level')
+    parser.add_argument('--p1', default='greedy', help='random, greedy, search:<depth> or mcts:<playouts>')
+    parser.add_argument('--p2', default='greedy', help='random, greedy, search:<depth> or mcts:<playouts>')
+    parser.add_argument('--workers', type=int, default=0, help='processes to use (0 = all cores)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-moves', type=int, default=DEFAULT_MAX_MOVES)
+    parser.add_argument('--output', help='write JSON lines here instead of stdout')
+    args = parser.parse_args(argv)
+
+    with open(args.levels, 'r') as f:
+        levels = json.load(f)
+    if args.level:
+        levels = [level for level in levels if level['name'] in args.level]
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    start = time.perf_counter()
+    played = 0
+    try:
+        for record in run_tournament(levels, args.games, args.p1, args.p2,
+                                     args.workers, args.seed, args.max_moves):
+            out.write(json.dumps(record) + '\n')
+            played += 1
+    finally:
+        if args.output:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{played} games in {elapsed:.2f}s ({played / elapsed * 60:.0f} games/min)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Fixed-size transposition table keyed by Zobrist hashes."""
+from array import array
+from typing import Optional, Tuple
+
+# Bound types for stored scores
+EXACT = 0
+LOWER = 1  # Score is a lower bound (search failed high)
+UPPER = 2  # Score is an upper bound (search failed low)
+
+NO_MOVE = (1 << 24) - 1
+
+# Each entry is a 64-bit key plus one packed 64-bit data word
+ENTRY_BYTES = 16
+BUCKET_SIZE = 2
+
+# Layout of the packed data word, low bits first:
+#   move (24: from index << 12 | to index), depth (8), flag + 1 (2), age (8), score (signed, rest)
+# The flag is stored plus one so a written slot is never zero, which marks an empty slot
+_DEPTH_SHIFT = 24
+_FLAG_SHIFT = 32
+_AGE_SHIFT = 34
+_SCORE_SHIFT = 42
+
+TTEntry = Tuple[int, int, int, Optional[Tuple[int, int]]]  # depth, score, flag, move
+
+
+class TranspositionTable:
+    """Two-way bucketed hash table with depth-preferred, age-based replacement.
+
+    Storage is two flat arrays sized from ``size_mb`` at construction, so
+    memory use stays fixed for the lifetime of the table. Within a bucket a
+    new result replaces an entry for the same key unless that entry is
+    deeper and from the current search; otherwise it evicts an entry left
+    over from an older search, or failing that the shallower entry.
+    """
+
+    def __init__(self, size_mb: float = 16):
+        buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * BUCKET_SIZE))
+        # Round down to a power of two so the bucket index is a mask
+        buckets = 1 << (buckets.bit_length() - 1)
+        self._bucket_mask = buckets - 1
+        self.capacity = buckets * BUCKET_SIZE
+        self._keys = array('Q', bytes(8 * self.capacity))
+        self._data = array('q', bytes(8 * self.capacity))
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self.capacity * ENTRY_BYTES
+
+    def new_search(self):
+        """Advance the age so entries from earlier searches become replaceable"""
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self):
+        """Drop every entry and reset statistics"""
+        self._keys = array('Q', bytes(8 * self.capacity))
+        self._data = array('q', bytes(8 * self.capacity))
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Return (depth, score, flag, move) stored for key, or None"""
+        self.probes += 1
+        slot = (key & self._bucket_mask) * BUCKET_SIZE
+        keys = self._keys
+        if keys[slot] != key:
+            slot += 1
+            if keys[slot] != key:
+                return None
+        data = self._data[slot]
+        if not data:
+            return None
+        self.hits += 1
+        packed_move = data & NO_MOVE
+        move = None if packed_move == NO_MOVE else (packed_move >> 12, packed_move & 0xFFF)
+        return ((data >> _DEPTH_SHIFT) & 0xFF, data >> _SCORE_SHIFT,
+                ((data >> _FLAG_SHIFT) & 0x3) - 1, move)
+
+    def store(self, key: int, depth: int, score: int, flag: int, move: Optional[Tuple[int, int]] = None):
+        """Record a search result, subject to the replacement policy"""
+        slot = (key & self._bucket_mask) * BUCKET_SIZE
+        keys = self._keys
+        data = self._data
+        age = self.age
+
+        if keys[slot] == key and data[slot]:
+            victim = slot
+        elif keys[slot + 1] == key and data[slot + 1]:
+            victim = slot + 1
+        else:
+            victim = None
+
+        if victim is not None:
+            old = data[victim]
+            old_age = (old >> _AGE_SHIFT) & 0xFF
+            old_depth = (old >> _DEPTH_SHIFT) & 0xFF
+            if old_age == age and old_depth > depth and flag != EXACT:
+                return
+            if move is None:
+                # Keep the previous best move for ordering if this result has none
+                move_bits = old & NO_MOVE
+                move = None if move_bits == NO_MOVE else (move_bits >> 12, move_bits & 0xFFF)
+        else:
+            first, second = data[slot], data[slot + 1]
+            if not first:
+                victim = slot
+            elif not second:
+                victim = slot + 1
+            else:
+                first_stale = ((first >> _AGE_SHIFT) & 0xFF) != age
+                second_stale = ((second >> _AGE_SHIFT) & 0xFF) != age
+                if first_stale != second_stale:
+                    victim = slot if first_stale else slot + 1
+                elif ((first >> _DEPTH_SHIFT) & 0xFF) <= ((second >> _DEPTH_SHIFT) & 0xFF):
+                    victim = slot
+                else:
+                    victim = slot + 1
+
+        packed_move = NO_MOVE if move is None else (move[0] << 12) | move[1]
+        keys[victim] = key
+        data[victim] = (packed_move | (min(depth, 0xFF) << _DEPTH_SHIFT) | ((flag + 1) << _FLAG_SHIFT)
+                        | (age << _AGE_SHIFT) | (score << _SCORE_SHIFT))
+
+    def hashfull(self) -> float:
+        """Fraction of slots written during the current search"""
+        data = self._data
+        age = self.age
+        used = sum(1 for word in data if word and ((word >> _AGE_SHIFT) & 0xFF) == age)
+        return used / self.capacity
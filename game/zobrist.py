@@ -0,0 +1,44 @@
+"""Zobrist keys for hashing Ataxx positions.
+
+Keys are drawn from a fixed-seed generator so hashes are stable across runs
+and processes, which lets them be stored in files such as opening books.
+"""
+import random
+from typing import List, Tuple
+
+MASK_64 = (1 << 64) - 1
+
+_rng = random.Random(0x41A7A8)
+
+# XORed in when player 2 is to move
+SIDE_KEY = _rng.getrandbits(64)
+
+# Per-cell keys, grown on demand so every board size shares the same prefix
+_piece_keys: List[List[int]] = [[], [], []]  # Index 0 unused so players index directly
+_blocker_keys: List[int] = []
+
+
+def _extend(cells: int):
+    """Generate keys until at least `cells` cells are covered"""
+    while len(_blocker_keys) < cells:
+        _piece_keys[1].append(_rng.getrandbits(64))
+        _piece_keys[2].append(_rng.getrandbits(64))
+        _blocker_keys.append(_rng.getrandbits(64))
+
+
+def piece_keys(cells: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Return (player 1 keys, player 2 keys) for the first `cells` cells"""
+    _extend(cells)
+    return tuple(_piece_keys[1][:cells]), tuple(_piece_keys[2][:cells])
+
+
+def layout_key(size: Tuple[int, int], blockers: int) -> int:
+    """Hash of the static part of a position: board size and blocker cells"""
+    rows, cols = size
+    _extend(rows * cols)
+    key = (rows * 0x9E3779B97F4A7C15 ^ cols * 0xC2B2AE3D27D4EB4F) & MASK_64
+    while blockers:
+        i = blockers.bit_length() - 1
+        blockers ^= 1 << i
+        key ^= _blocker_keys[i]
+    return key
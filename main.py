@@ -1,4 +1,9 @@
 #!/usr/bin/env python
+import time
+
+# Startup is measured from here to the first frame on screen
+START_TIME = time.perf_counter()
+
 from utils.kivy_config_helper import config_kivy
 
 # Initialize with fixed window size and ensure this comes before other Kivy imports
@@ -6,24 +11,55 @@ WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 config_kivy(WINDOW_WIDTH, WINDOW_HEIGHT)
 
+# Profiling must be switched on before the instrumented modules are imported
+from kivy.config import Config
+from utils import profiling
+if Config.has_option('ataxx', 'profile') and Config.getboolean('ataxx', 'profile'):
+    profiling.enable()
+
 from kivy.app import App
-from kivy.lang import Builder
-from kivy.uix.screenmanager import ScreenManager, Screen
+from kivy.clock import Clock
 from kivy.core.window import Window
+from kivy.logger import Logger
 
-# Import screens
+from ui.screen_manager import LazyScreenManager
 from ui.start_screen import StartScreen
-from ui.game_screen import GameScreen
-from ui.end_screen import EndScreen
+
+# Seconds after the first frame before the other screens are built
+PRELOAD_DELAY = 0.5
+
+def create_game_screen(**kwargs):
+    # Imported on first use: the game screen pulls in the engine, sounds and hints
+    from ui.game_screen import GameScreen
+    return GameScreen(**kwargs)
+
+def create_end_screen(**kwargs):
+    from ui.end_screen import EndScreen
+    return EndScreen(**kwargs)
 
 class AtaxxApp(App):
     def build(self):
-        # Create screen manager
-        sm = ScreenManager()
+        # Only the start screen is built up front; the others follow in the background
+        sm = LazyScreenManager()
         sm.add_widget(StartScreen(name='start'))
-        sm.add_widget(GameScreen(name='game'))
-        sm.add_widget(EndScreen(name='end'))
+        sm.register('game', create_game_screen)
+        sm.register('end', create_end_screen)
+        if profiling.ENABLED:
+            profiling.install_overlay(Window)
+        Window.bind(on_flip=self._on_first_frame)
         return sm
 
+    def _on_first_frame(self, *args):
+        """Report time to first frame, then start building the remaining screens"""
+        Window.unbind(on_flip=self._on_first_frame)
+        self.startup_time = time.perf_counter() - START_TIME
+        Logger.info(f'Startup: first frame after {self.startup_time * 1000:.0f} ms')
+        Clock.schedule_once(self.root.preload, PRELOAD_DELAY)
+
+    def on_stop(self):
+        # Log the audio dispatch delay report
+        if self.root.is_built('game'):
+            self.root.get_screen('game').audio.close()
+
 if __name__ == '__main__':
     AtaxxApp().run()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Incrementally maintained Board state against a full recompute.
+
+Piece counts, empty cells, mobility and the Zobrist hash are updated by
+apply_move and unmake_move. After every move of seeded random games, and
+after undoing each game move by move, they must equal the values a board
+rebuilt from the bare piece masks computes from scratch.
+"""
+import os
+import random
+
+import pytest
+
+from game.benchmarking import load_levels
+from game.board import Board
+
+LEVELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'levels.txt')
+GAMES_PER_LEVEL = 20
+
+LEVELS = load_levels(LEVELS_PATH)
+
+
+def _incremental_state(board: Board) -> tuple:
+    return (board.to_compact(), board.hash, board.get_piece_counts(), board.empty_count(),
+            board.mobility(1), board.mobility(2), board.has_valid_moves(1), board.has_valid_moves(2),
+            board._empty, tuple(board._mobile))
+
+
+def assert_matches_recompute(board: Board):
+    rebuilt = Board.from_compact(board.to_compact())
+    assert _incremental_state(board) == _incremental_state(rebuilt)
+    assert board.get_piece_counts() == board._scan_piece_counts()
+
+
+@pytest.mark.parametrize('level', LEVELS, ids=[level['name'] for level in LEVELS])
+def test_apply_and_unmake_match_recompute(level):
+    rng = random.Random(level['name'])
+    for _ in range(GAMES_PER_LEVEL):
+        board = Board(debug=False)
+        board.load_from_json(level)
+        start = _incremental_state(board)
+        records = []
+        player = 1
+        while player:
+            move = rng.choice(board.generate_moves(player))
+            before = _incremental_state(board)
+            record = board.apply_move(*move, player)
+            assert_matches_recompute(board)
+            # A single make/unmake round trip restores everything
+            board.unmake_move(record)
+            assert _incremental_state(board) == before
+            records.append(board.apply_move(*move, player))
+            player = board.next_player(player)
+        while records:
+            board.unmake_move(records.pop())
+            assert_matches_recompute(board)
+        assert _incremental_state(board) == start
+
+
+def test_make_move_reports_the_converted_pieces():
+    board = Board(debug=False)
+    board.load_from_json(LEVELS[0])
+    rng = random.Random(0)
+    player = 1
+    while player:
+        from_index, to_index = rng.choice(board.generate_moves(player))
+        opponent_before = {pos for pos in board.mask_to_cells(board.layout.full)
+                           if board.get_piece(pos) == 3 - player}
+        converted = board.make_move(board.position(from_index), board.position(to_index), player)
+        opponent_after = {pos for pos in board.mask_to_cells(board.layout.full)
+                          if board.get_piece(pos) == 3 - player}
+        assert set(converted) == opponent_before - opponent_after
+        assert_matches_recompute(board)
+        player = board.next_player(player)
@@ -0,0 +1,42 @@
+"""GameState undo and redo of turn, pass and game-over bookkeeping."""
+import os
+
+from game.benchmarking import load_levels
+from game.game_state import GameState
+from game.options import PVP
+
+LEVELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'levels.txt')
+
+
+def _started_game(time_limit=None) -> GameState:
+    game_state = GameState()
+    game_state.start_new_game(load_levels(LEVELS_PATH)[0], PVP, time_limit)
+    return game_state
+
+
+def _play_first_move(game_state: GameState):
+    from_pos, to_pos = game_state.board.get_all_moves(game_state.current_player)[0]
+    assert game_state.select_piece(from_pos)
+    game_state.make_move(from_pos, to_pos)
+
+
+def test_undo_after_a_timeout_clears_it():
+    game_state = _started_game(time_limit=1)
+    _play_first_move(game_state)
+    assert game_state.check_timeout(now=game_state.clock_started + 61)
+    assert game_state.is_game_over and game_state.timed_out
+
+    assert game_state.undo()
+    assert not game_state.is_game_over
+    assert not game_state.timed_out
+    assert game_state.winner is None
+
+
+def test_undo_and_redo_restore_the_turn():
+    game_state = _started_game()
+    _play_first_move(game_state)
+    after = game_state._turn_state(), game_state.board.to_compact()
+    assert game_state.undo()
+    assert game_state.current_player == 1
+    assert game_state.redo()
+    assert (game_state._turn_state(), game_state.board.to_compact()) == after
@@ -0,0 +1,40 @@
+"""Perft counts of every level in levels.txt against benchmarks.perft.KNOWN_COUNTS."""
+import os
+
+import pytest
+
+from benchmarks.perft import KNOWN_COUNTS, perft
+from game.benchmarking import load_levels
+from game.board import Board
+
+LEVELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'levels.txt')
+
+# Deepest perft checked; depth 5 takes minutes in pure Python
+MAX_DEPTH = 4
+
+LEVELS = load_levels(LEVELS_PATH)
+
+
+def _start_board(level: dict) -> Board:
+    board = Board()
+    board.load_from_json(level)
+    return board
+
+
+def test_every_level_has_known_counts():
+    missing = [level['name'] for level in LEVELS if len(KNOWN_COUNTS.get(level['name'], ())) < MAX_DEPTH]
+    assert not missing
+
+
+@pytest.mark.parametrize('level', LEVELS, ids=[level['name'] for level in LEVELS])
+def test_perft_matches_known_counts(level):
+    board = _start_board(level)
+    counts = tuple(perft(board, 1, depth) for depth in range(1, MAX_DEPTH + 1))
+    assert counts == KNOWN_COUNTS[level['name']][:MAX_DEPTH]
+
+
+def test_perft_leaves_the_board_unchanged():
+    board = _start_board(LEVELS[0])
+    before = board.to_compact(), board.hash, board.get_piece_counts()
+    perft(board, 1, 3)
+    assert (board.to_compact(), board.hash, board.get_piece_counts()) == before
@@ -0,0 +1,38 @@
+"""TranspositionTable packing and replacement."""
+from game.transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+
+def test_entry_that_packs_to_all_zero_fields_is_kept():
+    table = TranspositionTable(0.01)
+    table.store(12345, 0, 0, EXACT, (0, 0))
+    assert table.probe(12345) == (0, 0, EXACT, (0, 0))
+
+
+def test_entries_round_trip():
+    table = TranspositionTable(0.01)
+    table.store(1, 7, -10500, UPPER, None)
+    table.store(2, 3, 42, LOWER, (3, 9))
+    assert table.probe(1) == (7, -10500, UPPER, None)
+    assert table.probe(2) == (3, 42, LOWER, (3, 9))
+
+
+def test_deeper_entry_survives_only_within_its_search():
+    table = TranspositionTable(0.01)
+    table.store(1, 6, 10, LOWER, (1, 2))
+    table.store(1, 2, 20, LOWER, (1, 3))
+    assert table.probe(1)[0] == 6
+    table.new_search()
+    table.store(1, 2, 20, LOWER, (1, 3))
+    assert table.probe(1)[:2] == (2, 20)
+
+
+def test_stale_entry_is_evicted_before_a_current_one():
+    table = TranspositionTable(0.01)
+    buckets = table.capacity // 2
+    old, current, new = 1, 1 + buckets, 1 + 2 * buckets  # Same bucket
+    table.store(old, 9, 0, EXACT)
+    table.new_search()
+    table.store(current, 1, 0, EXACT)
+    table.store(new, 1, 0, EXACT)
+    assert table.probe(old) is None
+    assert table.probe(current) is not None and table.probe(new) is not None
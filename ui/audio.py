@@ -0,0 +1,108 @@
+import os
+import time
+
+from kivy.clock import Clock
+from kivy.core.audio import SoundLoader
+from kivy.logger import Logger
+
+SOUND_DIR = 'assets/sounds'
+SOUND_EXTENSIONS = ('.wav', '.ogg', '.mp3')
+
+# Voices per effect, so quick repeats overlap instead of restarting one sound
+VOICES_PER_EFFECT = 3
+
+
+class EffectStats:
+    """Dispatch delay samples for one effect, in seconds"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.stolen = 0  # Plays that had to cut off a voice still sounding
+
+    def add(self, delay: float):
+        self.count += 1
+        self.total += delay
+        self.worst = max(self.worst, delay)
+
+    def summary(self) -> dict:
+        return {'plays': self.count,
+                'mean_dispatch_ms': round(self.total / self.count * 1000, 2) if self.count else None,
+                'max_dispatch_ms': round(self.worst * 1000, 2),
+                'stolen_voices': self.stolen}
+
+
+class AudioManager:
+    """Preloaded sound effects started at the next frame.
+
+    Every file in the sound directory is loaded at construction, once per
+    voice, so nothing is decoded on first play. play() only queues the
+    request and arms a Clock trigger, which starts the queued effects on the
+    main thread at the start of the next frame, since Kivy sounds must not
+    be driven from other threads. Each request starts the next free voice
+    of its effect, or the longest-playing one if all are busy. The dispatch
+    delay, from the play() call until Sound.play() has handed the voice to
+    the audio backend, is measured per effect and returned by report(). The
+    backend's own output buffering is not included.
+    """
+
+    def __init__(self, sound_dir: str = SOUND_DIR, voices: int = VOICES_PER_EFFECT):
+        self._voices = {}  # effect name -> list of Sound
+        self._next_voice = {}  # effect name -> index of the voice to try first
+        self.stats = {}  # effect name -> EffectStats
+        start = time.perf_counter()
+        for filename in sorted(os.listdir(sound_dir)) if os.path.isdir(sound_dir) else []:
+            name, extension = os.path.splitext(filename)
+            if extension.lower() not in SOUND_EXTENSIONS:
+                continue
+            path = os.path.join(sound_dir, filename)
+            sounds = [sound for sound in (SoundLoader.load(path) for _ in range(voices)) if sound]
+            if sounds:
+                self._voices[name] = sounds
+                self._next_voice[name] = 0
+                self.stats[name] = EffectStats()
+        self.load_time = time.perf_counter() - start
+        Logger.info(f'Audio: preloaded {len(self._voices)} effects in {self.load_time * 1000:.1f} ms')
+
+        self._requests = []  # (effect name, time of the play() call)
+        self._dispatch = Clock.create_trigger(self._start_requests)
+
+    def play(self, name: str):
+        """Queue an effect by file name without extension; unknown names are ignored"""
+        if name in self._voices:
+            self._requests.append((name, time.perf_counter()))
+            self._dispatch()
+
+    def report(self) -> dict:
+        """Dispatch delay summary per effect"""
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+    def close(self):
+        """Drop queued effects and log the dispatch delay report"""
+        self._dispatch.cancel()
+        self._requests.clear()
+        Logger.info(f'Audio: dispatch delay {self.report()}')
+
+    def _start_requests(self, dt):
+        requests, self._requests = self._requests, []
+        for name, requested in requests:
+            sound = self._free_voice(name)
+            if sound.state == 'play':
+                sound.stop()
+            sound.play()
+            self.stats[name].add(time.perf_counter() - requested)
+
+    def _free_voice(self, name: str):
+        """Next idle voice in round-robin order, else the one started longest ago"""
+        sounds = self._voices[name]
+        first = self._next_voice[name]
+        for i in range(len(sounds)):
+            sound = sounds[(first + i) % len(sounds)]
+            if sound.state != 'play':
+                self._next_voice[name] = (first + i + 1) % len(sounds)
+                return sound
+        # Round-robin order means the voice at `first` is the oldest still playing
+        self.stats[name].stolen += 1
+        self._next_voice[name] = (first + 1) % len(sounds)
+        return sounds[first]
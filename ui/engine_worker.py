@@ -0,0 +1,88 @@
+import sys
+import threading
+from contextlib import contextmanager
+
+from kivy.clock import Clock
+
+from game.engine import SearchCancelled
+
+# A shorter GIL switch interval keeps the Kivy main thread responsive while a
+# search thread is busy running pure-Python code
+SEARCH_SWITCH_INTERVAL = 0.001
+
+_switch_lock = threading.Lock()
+_running_searches = 0
+_saved_switch_interval = None
+
+
+@contextmanager
+def search_switch_interval():
+    """Use SEARCH_SWITCH_INTERVAL while any search thread is inside this block
+
+    The interval is process-wide, so the previous value is restored when the
+    last overlapping search leaves.
+    """
+    global _running_searches, _saved_switch_interval
+    with _switch_lock:
+        if not _running_searches:
+            _saved_switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(SEARCH_SWITCH_INTERVAL)
+        _running_searches += 1
+    try:
+        yield
+    finally:
+        with _switch_lock:
+            _running_searches -= 1
+            if not _running_searches:
+                sys.setswitchinterval(_saved_switch_interval)
+
+
+class EngineWorker:
+    """Runs engine searches on a background thread.
+
+    The search works on a copy of the board so the UI can keep reading the
+    live position. Results are handed back on the Kivy main thread through
+    Clock.schedule_once. Starting a new search or calling cancel() stops the
+    previous one, and its result is never delivered.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._stop_event = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a search thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, engine, board, player, callback):
+        """Search board for player in the background and call callback(result) on the main thread"""
+        self.cancel()
+        if self._thread is not None:
+            # A cancelled search stops within one budget check; wait so two
+            # threads never share the engine's tables
+            self._thread.join()
+        stop_event = threading.Event()
+        search_board = board.copy()
+
+        def deliver(result):
+            if not stop_event.is_set():
+                callback(result)
+
+        def run():
+            try:
+                with search_switch_interval():
+                    result = engine.search(search_board, player, stop_event=stop_event)
+            except SearchCancelled:
+                return
+            Clock.schedule_once(lambda dt: deliver(result))
+
+        self._stop_event = stop_event
+        self._thread = threading.Thread(target=run, name='engine-search', daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop the running search, if any, and drop its result"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        self._stop_event = None
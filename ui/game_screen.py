@@ -1,13 +1,30 @@
+import math
+from array import array
 from kivy.uix.screenmanager import Screen
 from kivy.uix.widget import Widget
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
-from kivy.graphics import Color, Rectangle, Ellipse, Line
+from kivy.uix.togglebutton import ToggleButton
+from kivy.graphics import (Color, Rectangle, Mesh, Line, InstructionGroup, Fbo,
+                           ClearColor, ClearBuffers)
+from kivy.graphics.texture import Texture
 from kivy.clock import Clock
-from kivy.core.audio import SoundLoader
 from kivy.animation import Animation
 from kivy.metrics import dp
-from game.game_state import GameState
+from kivy.logger import Logger
+from game.game_state import GameState, PVP
+from game.options import DEFAULT_DIFFICULTY
+from game.records import DEFAULT_RECORDS_PATH, RecordError, append_game, record_game
+from ui.audio import AudioManager
+from ui.engine_worker import EngineWorker
+from ui.hints import HintWorker
+from utils.profiling import profiled
+
+# Pause before the computer replies so its move is visible as a separate turn
+COMPUTER_MOVE_DELAY = 0.4
+
+# Wake slightly after a timer second boundary so the label has already changed
+CLOCK_EPSILON = 0.01
 
 class GameScreen(Screen):
     def __init__(self, **kwargs):
@@ -32,7 +49,11 @@ class GameScreen(Screen):
         self.p1_box.add_widget(self.p1_time)
         self.info_bar.add_widget(self.p1_box)
         
-        # Center spacer
+        # Hint toggle between spacers
+        self.info_bar.add_widget(Widget())
+        self.hint_button = ToggleButton(text='Hint', size_hint_x=None, width=dp(80))
+        self.hint_button.bind(state=lambda *args: self._refresh_hint())
+        self.info_bar.add_widget(self.hint_button)
         self.info_bar.add_widget(Widget())
         
         # Player 2 info
@@ -51,53 +72,180 @@ class GameScreen(Screen):
         
         self.add_widget(self.layout)
         
-        # Load sound effects
-        self.sound_move = SoundLoader.load('assets/sounds/move.wav')
-        self.sound_jump = SoundLoader.load('assets/sounds/jump.wav')
-        self.sound_capture = SoundLoader.load('assets/sounds/capture.wav')
-        self.sound_game_end = SoundLoader.load('assets/sounds/game_end.wav')
+        # Preload sound effects
+        self.audio = AudioManager()
         
         self.game_state = None
-        
-        # Start update clock
-        Clock.schedule_interval(self.update, 1.0/60.0)
+        self.engine_worker = EngineWorker()
+        self.hint_worker = HintWorker()
+        self._clock_event = None  # Next timer label change or timeout, while a timed game is on screen
+        self._end_scheduled = False
 
     def reset_game(self):
         """Reset the game screen state"""
+        self._stop_clock()
+        self._end_scheduled = False
+        Clock.unschedule(self._start_computer_search)
+        self.engine_worker.cancel()
+        self.hint_worker.cancel()
         self.game_state = None
-        self.board_widget.game_state = None
         self.board_widget.clear_board()
         self.p1_time.text = '--:--'
         self.p2_time.text = '--:--'
         self.p1_score.text = 'Player 1: 2'
         self.p2_score.text = 'Player 2: 2'
 
-    def start_new_game(self, level_data, time_limit):
+    def start_new_game(self, level_data, time_limit, game_mode=PVP, difficulty=DEFAULT_DIFFICULTY):
         """Initialize a new game"""
         self.game_state = GameState()
-        self.game_state.start_new_game(level_data, 'pvp', time_limit)
-        self.board_widget.game_state = self.game_state
+        self.game_state.start_new_game(level_data, game_mode, time_limit, difficulty)
+        self.board_widget.set_game_state(self.game_state)
         self._update_labels()
-        self.board_widget._update_board()
+        self._schedule_clock()
+        self._refresh_hint()
+        self._schedule_computer_move()
+
+    def play_move(self, from_pos, to_pos):
+        """Apply a move for the current player with sounds and end-of-game handling"""
+        converted = self.game_state.make_move(from_pos, to_pos)
+        self._after_move(from_pos, to_pos, converted)
+
+    @profiled
+    def _after_move(self, from_pos, to_pos, converted):
+        """Play move sounds, redraw and hand over to the computer if needed"""
+        dx = abs(from_pos[0] - to_pos[0])
+        dy = abs(from_pos[1] - to_pos[1])
+        is_jump = dx > 1 or dy > 1
+
+        if is_jump:
+            self.audio.play('jump')
+        else:
+            self.audio.play('move')
+
+        if converted:
+            self.audio.play('capture')
+
+        # Only the move's cells and the highlights it cleared need redrawing
+        self.board_widget.update_cells([from_pos, to_pos, *converted])
+        self._update_labels()
+
+        self._refresh_hint()
+        if self.game_state.is_game_over:
+            self._finish_game()
+            return
+        self._schedule_clock()
+        self._schedule_computer_move()
+
+    def _schedule_computer_move(self):
+        if self.game_state and self.game_state.is_computer_turn():
+            Clock.schedule_once(self._start_computer_search, COMPUTER_MOVE_DELAY)
+
+    def _start_computer_search(self, dt):
+        """Start the engine on a background thread; the frame loop keeps running"""
+        game_state = self.game_state
+        if not game_state or not game_state.is_computer_turn():
+            return
+        self.engine_worker.start(
+            game_state.engine, game_state.board, game_state.current_player,
+            lambda result: self._play_computer_move(game_state, result)
+        )
+
+    def _play_computer_move(self, game_state, result):
+        """Apply the engine's move once its search finishes"""
+        if game_state is not self.game_state or not game_state.is_computer_turn():
+            return  # The game was reset or ended while the engine was thinking
+        played = game_state.apply_move(result.move)
+        if played is None:
+            return
+        self._after_move(*played)
+
+    def on_enter(self):
+        """Resume the timer events for a game left running"""
+        self._schedule_clock()
+
+    def on_leave(self):
+        """Stop any engine search and timer events when leaving the game screen"""
+        self._stop_clock()
+        Clock.unschedule(self._start_computer_search)
+        self.engine_worker.cancel()
+        self.hint_worker.cancel()
+
+    def _refresh_hint(self):
+        """Analyse the new position for the human on move while hints are on, else hide the hint"""
+        game_state = self.game_state
+        if (self.hint_button.state != 'down' or not game_state or game_state.is_game_over
+                or game_state.is_computer_turn()):
+            self.hint_worker.cancel()
+            self.board_widget.set_hint(None)
+            return
+        key = game_state.hash
+        self.board_widget.set_hint(None)
+        self.hint_worker.request(game_state.board, game_state.current_player,
+                                 lambda result: self._show_hint(game_state, key, result))
 
-    def update(self, dt):
-        """Update game state and UI"""
+    def _show_hint(self, game_state, key, result):
+        """Show a hint result if its position is still the one on the board"""
+        if game_state is self.game_state and game_state.hash == key and self.hint_button.state == 'down':
+            self.board_widget.set_hint(result.move)
+
+    def _schedule_clock(self):
+        """Wake up when the mover's displayed second next changes, which also covers the timeout"""
+        self._stop_clock()
+        game_state = self.game_state
+        if not game_state or not game_state.time_limit or game_state.is_game_over:
+            return
+        remaining = game_state.remaining_time(game_state.current_player)
+        # Displayed seconds are truncated, so the label changes just below the next whole second
+        delay = max(0, remaining - math.floor(remaining)) + CLOCK_EPSILON
+        self._clock_event = Clock.schedule_once(self._on_clock, delay)
+
+    def _stop_clock(self):
+        if self._clock_event is not None:
+            self._clock_event.cancel()
+            self._clock_event = None
+
+    @profiled
+    def _on_clock(self, dt):
+        """Refresh the timer labels and end the game on timeout"""
+        self._clock_event = None
         if not self.game_state:
             return
-            
-        self.game_state.update_time(dt)
-        self._update_labels()
-        
-        if self.game_state.is_game_over and not self.manager.current == 'end':
-            self.sound_game_end.play()
-            Clock.schedule_once(lambda dt: self.show_game_end(), 1.5)
+        if self.game_state.check_timeout():
+            Clock.unschedule(self._start_computer_search)
+            self.engine_worker.cancel()
+            self._update_labels()
+            self._finish_game()
+            return
+        self._update_time_labels()
+        self._schedule_clock()
+
+    def _finish_game(self):
+        """Play the end sound and switch to the end screen, once per game"""
+        self._stop_clock()
+        if self._end_scheduled:
+            return
+        self._end_scheduled = True
+        self._save_record()
+        self.audio.play('game_end')
+        Clock.schedule_once(lambda dt: self.show_game_end(), 1.5)
+
+    def _save_record(self):
+        """Append the finished game to the records file"""
+        try:
+            append_game(DEFAULT_RECORDS_PATH, record_game(self.game_state))
+        except (OSError, RecordError) as e:
+            Logger.warning(f'Records: could not save the game: {e}')
 
+    @profiled
     def _update_labels(self):
         """Update score and time labels"""
         p1_count, p2_count = self.game_state.board.get_piece_counts()
         self.p1_score.text = f'Player 1: {p1_count}'
         self.p2_score.text = f'Player 2: {p2_count}'
-        
+        self._update_time_labels()
+
+    def _update_time_labels(self):
+        """Update the timer labels"""
         if self.game_state.time_limit:
             time1, time2 = self.game_state.get_current_time()
             self.p1_time.text = time1
@@ -107,155 +255,296 @@ class GameScreen(Screen):
         """Switch to end screen"""
         self.manager.current = 'end'
 
+# Cell colours
+BACKGROUND_COLOR = (0.8, 0.8, 0.8, 1)
+GRID_COLOR = (0.3, 0.3, 0.3, 1)
+BLOCKER_COLOR = (0.3, 0.3, 0.3, 1)  # Dark gray for obstacles
+PIECE_COLORS = {1: (0.9, 0.1, 0.1, 1), 2: (0.1, 0.1, 0.9, 1)}  # Red for player 1, blue for player 2
+SELECTED_COLOR = (1, 1, 0, 0.3)
+VALID_MOVE_COLOR = (0, 1, 0, 0.3)
+HINT_COLOR = (0, 0.8, 1, 0.35)
+
+# Pieces are drawn from a white disc texture of this many pixels square, tinted per player
+PIECE_TEXTURE_SIZE = 64
+PIECE_SCALE = 0.8  # Piece diameter as a share of the cell
+
+# Grid drawn when no game is loaded
+DEFAULT_GRID_SIZE = (7, 7)
+
+# Corners of a piece quad as (x, y) offsets in piece diameters, with the
+# texture coordinates equal to the offsets; two triangles per quad
+QUAD_CORNERS = ((0, 0), (1, 0), (1, 1), (0, 1))
+QUAD_INDICES = (0, 1, 2, 2, 3, 0)
+QUAD_FLOATS = 16  # Four vertices of x, y, u, v
+
+_piece_texture = None
+
+
+def piece_texture():
+    """Mipmapped white disc with a soft edge, created on first use"""
+    global _piece_texture
+    if _piece_texture is None:
+        size = PIECE_TEXTURE_SIZE
+        radius = size / 2
+        pixels = bytearray()
+        for y in range(size):
+            for x in range(size):
+                distance = math.hypot(x + 0.5 - radius, y + 0.5 - radius)
+                alpha = max(0.0, min(1.0, radius - distance))
+                pixels += bytes((255, 255, 255, int(alpha * 255)))
+        texture = Texture.create(size=(size, size), colorfmt='rgba', mipmap=True)
+        texture.min_filter = 'linear_mipmap_linear'
+        texture.blit_buffer(bytes(pixels), colorfmt='rgba', bufferfmt='ubyte')
+        _piece_texture = texture
+    return _piece_texture
+
+
+class PieceLayer:
+    """Every piece on the board in one textured mesh per player.
+
+    Each open cell has a fixed quad slot in every mesh. A cell's quad is
+    filled in the mesh of the player on it and collapsed to a point in the
+    others, so a move rewrites a few slots and each player costs one draw
+    call however large the board is.
+    """
+
+    def __init__(self, cells):
+        self.slots = {pos: slot for slot, pos in enumerate(cells)}
+        self._pieces = [0] * len(cells)  # Player drawn in each slot
+        self._quads = [(0.0,) * QUAD_FLOATS] * len(cells)  # Placed quad of each slot
+        indices = array('H', (4 * slot + i for slot in range(len(cells)) for i in QUAD_INDICES))
+        self.instructions = []
+        self._vertices = {}  # player -> array of x, y, u, v per slot
+        self._meshes = {}
+        self._dirty = set()  # Players whose vertices changed since the last flush
+        for player, rgba in PIECE_COLORS.items():
+            self._vertices[player] = array('f', bytes(4 * QUAD_FLOATS * len(cells)))
+            self._meshes[player] = Mesh(vertices=self._vertices[player], indices=indices,
+                                        mode='triangles', texture=piece_texture())
+            self.instructions += [Color(rgba=rgba), self._meshes[player]]
+
+    def place(self, origin, cell_size):
+        """Position every slot for cells of cell_size with the board's corner at origin"""
+        diameter = cell_size * PIECE_SCALE
+        inset = cell_size * (1 - PIECE_SCALE) / 2
+        for (x, y), slot in self.slots.items():
+            left = origin[0] + x * cell_size + inset
+            bottom = origin[1] + y * cell_size + inset
+            self._quads[slot] = tuple(value for u, v in QUAD_CORNERS
+                                      for value in (left + u * diameter, bottom + v * diameter, u, v))
+            if self._pieces[slot]:
+                self._write(self._pieces[slot], slot, self._quads[slot])
+        self.flush()
+
+    def show(self, pos, piece):
+        """Draw piece (0 for none) in the cell at pos; call flush() after a batch"""
+        slot = self.slots.get(pos)
+        if slot is None or self._pieces[slot] == piece:
+            return
+        old = self._pieces[slot]
+        if old:
+            self._write(old, slot, (0.0,) * QUAD_FLOATS)
+        if piece in self._vertices:
+            self._write(piece, slot, self._quads[slot])
+        self._pieces[slot] = piece
+
+    def flush(self):
+        """Send changed vertices to the meshes"""
+        for player in self._dirty:
+            self._meshes[player].vertices = self._vertices[player]
+        self._dirty.clear()
+
+    def _write(self, player, slot, quad):
+        start = slot * QUAD_FLOATS
+        self._vertices[player][start:start + QUAD_FLOATS] = array('f', quad)
+        self._dirty.add(player)
+
+
 class BoardWidget(Widget):
+    """Draws the board as a cached static layer, a piece layer and highlights.
+
+    The grid follows the level's declared size. The background, grid and
+    blockers never change during a game, so they are rendered once into an
+    Fbo per level layout and board size and drawn as a single textured
+    rectangle. Pieces are drawn by a PieceLayer built once per layout and
+    only moved on size or position changes; otherwise only the cells passed
+    to update_cells() are redrawn. The few highlighted cells are redrawn
+    when the highlights change.
+    """
+
     def __init__(self, game_screen=None, **kwargs):
         super().__init__(**kwargs)
         self.game_screen = game_screen
         self.game_state = None
-        self.bind(pos=self._update_board, size=self._update_board)
+        self.cell_size = 0
+        self._origin = (0, 0)
+        self._grid_size = None  # (rows, cols, blockers) the piece layer was built for
+        self._pieces = None  # PieceLayer
+        self._highlight_group = None
+        self._highlighted = {}  # Cells drawn with a selection, valid-move or hint highlight -> colour
+        self.hint_move = None  # (from_pos, to_pos) suggested for the side to move
+        self._static_rect = None  # Textured rectangle showing the static layer
+        self._static_key = None  # (layout, width, height) the cached static layer was drawn for
+        self._static_fbo = None
+        self.bind(pos=self._layout_board, size=self._layout_board)
         self.size_hint = (1, 1)
 
+    def set_game_state(self, game_state):
+        """Show a new game, redrawing the static layer only if the level layout differs"""
+        self.game_state = game_state
+        self._layout_board()
+
     def clear_board(self):
         """Clear the board state"""
-        self.game_state = None
-        self.canvas.clear()
-        self._update_board()
+        self.set_game_state(None)
+
+    @profiled
+    def _layout_board(self, *args):
+        """Fit the board to the widget, rebuilding the piece layer only for a new layout"""
+        board = self.game_state.board if self.game_state else None
+        # Using x,y consistently: x runs across the widget, y up it
+        rows, cols = board.size if board else DEFAULT_GRID_SIZE
+        blockers = board.layout.blockers if board else 0
+        if (rows, cols, blockers) != self._grid_size:
+            self._build_cells(rows, cols, blockers)
 
-    def _update_board(self, *args):
-        """Update the board display"""
-        self.canvas.clear()
-        
         # Calculate board dimensions
-        self.cell_size = min(self.width, self.height) / 7
-        board_width = self.cell_size * 7
-        board_height = self.cell_size * 7
+        self.cell_size = min(self.width / rows, self.height / cols)
+        board_width = self.cell_size * rows
+        board_height = self.cell_size * cols
         x_offset = (self.width - board_width) / 2
         y_offset = (self.height - board_height) / 2
-        
+        self._origin = (self.pos[0] + x_offset, self.pos[1] + y_offset)
+
+        self._static_rect.texture = self._static_texture(board_width, board_height)
+        self._static_rect.pos = self._origin
+        self._static_rect.size = (board_width, board_height)
+        self._pieces.place(self._origin, self.cell_size)
+        self._update_board()
+        self._draw_highlights()
+
+    def _build_cells(self, rows, cols, blockers):
+        """Recreate the canvas: the static layer, then the pieces, then highlights"""
+        self.canvas.clear()
         with self.canvas:
+            Color(1, 1, 1, 1)
+            self._static_rect = Rectangle()
+        # Blockers live in the static layer and never hold a piece
+        self._pieces = PieceLayer([(x, y) for x in range(rows) for y in range(cols)
+                                   if not blockers >> (x * cols + y) & 1])
+        for instruction in self._pieces.instructions:
+            self.canvas.add(instruction)
+        self._highlight_group = InstructionGroup()
+        self.canvas.add(self._highlight_group)
+        self._highlighted = {}
+        self._grid_size = (rows, cols, blockers)
+
+    def _static_texture(self, board_width, board_height):
+        """Texture with the background, grid and blockers, redrawn only when the key changes"""
+        width, height = int(board_width), int(board_height)
+        if width < 1 or height < 1:
+            return None
+        board = self.game_state.board if self.game_state else None
+        key = (board.layout if board else None, width, height)
+        if key == self._static_key:
+            return self._static_fbo.texture
+
+        rows, cols = board.size if board else DEFAULT_GRID_SIZE
+        cell_size = width / rows
+        fbo = Fbo(size=(width, height))
+        with fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
             # Draw board background
-            Color(0.8, 0.8, 0.8)
-            Rectangle(pos=(self.pos[0] + x_offset, self.pos[1] + y_offset), 
-                     size=(board_width, board_height))
+            Color(*BACKGROUND_COLOR)
+            Rectangle(pos=(0, 0), size=(width, height))
             
             # Draw grid lines
-            Color(0.3, 0.3, 0.3)
-            for i in range(8):
-                Line(points=[
-                    self.pos[0] + x_offset + i * self.cell_size,
-                    self.pos[1] + y_offset,
-                    self.pos[0] + x_offset + i * self.cell_size,
-                    self.pos[1] + y_offset + board_height
-                ])
-                Line(points=[
-                    self.pos[0] + x_offset,
-                    self.pos[1] + y_offset + i * self.cell_size,
-                    self.pos[0] + x_offset + board_width,
-                    self.pos[1] + y_offset + i * self.cell_size
-                ])
-
-        # If there's no game state, stop here
+            Color(*GRID_COLOR)
+            for i in range(rows + 1):
+                Line(points=[i * cell_size, 0, i * cell_size, height])
+            for i in range(cols + 1):
+                Line(points=[0, i * cell_size, width, i * cell_size])
+
+            # Draw blockers
+            if board is not None:
+                Color(*BLOCKER_COLOR)
+                for x, y in board.mask_to_cells(board.layout.blockers):
+                    Rectangle(pos=(x * cell_size, y * cell_size), size=(cell_size, cell_size))
+        fbo.draw()
+        self._static_key = key
+        self._static_fbo = fbo
+        return fbo.texture
+
+    @profiled
+    def _update_board(self, *args):
+        """Redraw every cell from the game state"""
+        self.update_cells(self._pieces.slots)
+
+    @profiled
+    def update_cells(self, cells):
+        """Redraw the pieces in the given cells, and the highlights if they changed"""
+        board = self.game_state.board if self.game_state else None
+        for pos in cells:
+            self._pieces.show(pos, board.get_piece(pos) if board else 0)
+        self._pieces.flush()
+        highlights = self._highlights()
+        if highlights != self._highlighted:
+            self._highlighted = highlights
+            self._draw_highlights()
+
+    def _draw_highlights(self):
+        group = self._highlight_group
+        group.clear()
+        for (x, y), rgba in self._highlighted.items():
+            group.add(Color(rgba=rgba))
+            group.add(Rectangle(pos=(self._origin[0] + x * self.cell_size, self._origin[1] + y * self.cell_size),
+                                size=(self.cell_size, self.cell_size)))
+
+    def set_hint(self, move):
+        """Highlight a suggested (from_pos, to_pos) move, or clear it with None"""
+        if move != self.hint_move:
+            self.hint_move = move
+            self.update_cells(())
+
+    def _highlights(self):
+        """Map of highlighted cells to their colour"""
         if not self.game_state:
-            return
-            
-        # Draw pieces and obstacles
-        with self.canvas:
-            for x in range(7):
-                for y in range(7):
-                    piece = self.game_state.board.board[x][y]
-                    if piece == 9:  # Untraversable cell
-                        Color(0.3, 0.3, 0.3)  # Dark gray for obstacles
-                        Rectangle(
-                            pos=(
-                                self.pos[0] + x_offset + x * self.cell_size,
-                                self.pos[1] + y_offset + y * self.cell_size
-                            ),
-                            size=(self.cell_size, self.cell_size)
-                        )
-                    elif piece in [1, 2]:  # Player pieces
-                        if piece == 1:
-                            Color(0.9, 0.1, 0.1)  # Red for player 1
-                        else:
-                            Color(0.1, 0.1, 0.9)  # Blue for player 2
-                            
-                        Ellipse(
-                            pos=(
-                                self.pos[0] + x_offset + x * self.cell_size + self.cell_size * 0.1,
-                                self.pos[1] + y_offset + y * self.cell_size + self.cell_size * 0.1
-                            ),
-                            size=(self.cell_size * 0.8, self.cell_size * 0.8)
-                        )
-            
-            # Highlight selected piece
-            if self.game_state.selected_piece:
-                x, y = self.game_state.selected_piece
-                Color(1, 1, 0, 0.3)
-                Rectangle(
-                    pos=(
-                        self.pos[0] + x_offset + x * self.cell_size,
-                        self.pos[1] + y_offset + y * self.cell_size
-                    ),
-                    size=(self.cell_size, self.cell_size)
-                )
-                
-            # Highlight valid moves
-            Color(0, 1, 0, 0.3)
-            for move in self.game_state.valid_moves:
-                x, y = move
-                Rectangle(
-                    pos=(
-                        self.pos[0] + x_offset + x * self.cell_size,
-                        self.pos[1] + y_offset + y * self.cell_size
-                    ),
-                    size=(self.cell_size, self.cell_size)
-                )
+            return {}
+        highlights = {pos: HINT_COLOR for pos in self.hint_move or ()}
+        highlights.update((pos, VALID_MOVE_COLOR) for pos in self.game_state.valid_moves)
+        if self.game_state.selected_piece:
+            highlights[self.game_state.selected_piece] = SELECTED_COLOR
+        return highlights
 
+    @profiled
     def on_touch_down(self, touch):
         if not self.collide_point(*touch.pos) or not self.game_state:
             return False
+        if self.game_state.is_computer_turn():
+            return True  # Ignore input while the computer is thinking
+        if not self.cell_size:
+            return False
             
-        board_width = self.cell_size * 7
-        board_height = self.cell_size * 7
-        x_offset = (self.width - board_width) / 2
-        y_offset = (self.height - board_height) / 2
+        board_x = int((touch.x - self._origin[0]) // self.cell_size)
+        board_y = int((touch.y - self._origin[1]) // self.cell_size)
         
-        board_x = int((touch.x - self.pos[0] - x_offset) // self.cell_size)
-        board_y = int((touch.y - self.pos[1] - y_offset) // self.cell_size)
-        
-        if not (0 <= board_x < 7 and 0 <= board_y < 7):
+        rows, cols = self._grid_size[:2]
+        if not (0 <= board_x < rows and 0 <= board_y < cols):
             return False
             
         pos = (board_x, board_y)
         
         if not self.game_state.selected_piece:
             if self.game_state.select_piece(pos):
-                self._update_board()
+                self.update_cells(())
             return True
             
         if pos in self.game_state.valid_moves:
-            from_pos = self.game_state.selected_piece
-            dx = abs(from_pos[0] - pos[0])
-            dy = abs(from_pos[1] - pos[1])
-            is_jump = dx > 1 or dy > 1
-            
-            converted = self.game_state.make_move(self.game_state.selected_piece, pos)
-            
-            if is_jump:
-                self.game_screen.sound_jump.play()
-            else:
-                self.game_screen.sound_move.play()
-                
-            if converted:
-                self.game_screen.sound_capture.play()
-            
-            if self.game_state.is_game_over:
-                self.game_screen.sound_game_end.play()
-                Clock.schedule_once(lambda dt: self.game_screen.show_game_end(), 1.5)
-                
-            self._update_board()
+            self.game_screen.play_move(self.game_state.selected_piece, pos)
             return True
             
         self.game_state.selected_piece = None
         self.game_state.valid_moves = []
-        self._update_board()
-        return True
\ No newline at end of file
+        self.update_cells(())
+        return True
@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+
+from kivy.clock import Clock
+
+from game.book import open_book
+from game.engine import SearchCancelled, SearchEngine
+from ui.engine_worker import search_switch_interval
+
+# Budget for one hint analysis; deeper iterations refine the hint as they finish
+HINT_MAX_DEPTH = 64
+HINT_TIME_LIMIT = 3.0
+
+# Positions whose hints are remembered
+HINT_CACHE_SIZE = 512
+
+
+class HintWorker:
+    """Suggests moves for the side to move from a background search.
+
+    Results are cached by position key. A finished analysis is returned
+    straight from the cache, so asking again, or going back to a position
+    with undo or redo, costs nothing. Otherwise any partial result is
+    delivered at once, and each deeper iteration is delivered as it
+    completes. Callbacks run on the Kivy main thread. Like EngineWorker,
+    starting a new analysis or calling cancel() stops the previous one.
+    The hint engine has its own tables, separate from the opponent's engine.
+    """
+
+    def __init__(self):
+        self._engine = None  # Built on the first hint; its tables take a moment to allocate
+        self._cache = OrderedDict()  # position key -> (SearchResult, finished)
+        self._thread = None
+        self._stop_event = None
+        self._key = None  # Position being analysed
+        self._callback = None
+
+    @property
+    def engine(self) -> SearchEngine:
+        if self._engine is None:
+            self._engine = SearchEngine(max_depth=HINT_MAX_DEPTH, time_limit=HINT_TIME_LIMIT, book=open_book())
+        return self._engine
+
+    def request(self, board, player, callback):
+        """Call callback(result) with the best known hint now and again as it improves"""
+        key = board.position_key(player)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            callback(cached[0])
+            if cached[1]:
+                self.cancel()
+                return
+        if key == self._key and self._thread is not None and self._thread.is_alive():
+            self._callback = callback  # Same position still being analysed
+            return
+        self._start(board.copy(), player, key, callback)
+
+    def cancel(self):
+        """Stop the running analysis, if any, and drop its results"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        self._stop_event = None
+        self._key = None
+
+    def _start(self, board, player, key, callback):
+        self.cancel()
+        if self._thread is not None:
+            # Wait for the old search so two threads never share the engine's tables
+            self._thread.join()
+        stop_event = threading.Event()
+        self._callback = callback
+
+        def deliver(result, finished):
+            if stop_event.is_set():
+                return
+            self._store(key, result, finished)
+            self._callback(result)
+
+        def run():
+            try:
+                with search_switch_interval():
+                    result = self.engine.search(
+                        board, player, stop_event=stop_event,
+                        on_iteration=lambda partial: Clock.schedule_once(lambda dt: deliver(partial, False)))
+            except SearchCancelled:
+                return
+            Clock.schedule_once(lambda dt: deliver(result, True))
+
+        self._stop_event = stop_event
+        self._key = key
+        self._thread = threading.Thread(target=run, name='hint-search', daemon=True)
+        self._thread.start()
+
+    def _store(self, key, result, finished):
+        cached = self._cache.get(key)
+        if cached is not None and cached[1] and not finished:
+            return  # Keep the finished analysis
+        self._cache[key] = (result, finished)
+        self._cache.move_to_end(key)
+        if len(self._cache) > HINT_CACHE_SIZE:
+            self._cache.popitem(last=False)
@@ -0,0 +1,35 @@
+from kivy.clock import Clock
+from kivy.uix.screenmanager import ScreenManager
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds registered screens the first time they are needed.
+
+    get_screen() and switching to a screen create it on demand. preload()
+    builds the remaining screens in the background, one per frame, so no
+    single frame has to pay for all of them.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._factories = {}  # name -> callable(name=...) returning the screen, until built
+
+    def register(self, name, factory):
+        """Build the screen named name with factory(name=name) on first use"""
+        self._factories[name] = factory
+
+    def get_screen(self, name):
+        factory = self._factories.pop(name, None)
+        if factory is not None:
+            self.add_widget(factory(name=name))
+        return super().get_screen(name)
+
+    def is_built(self, name) -> bool:
+        return self.has_screen(name)
+
+    def preload(self, *args):
+        """Build the next pending screen and schedule the rest for later frames"""
+        if self._factories:
+            self.get_screen(next(iter(self._factories)))
+        if self._factories:
+            Clock.schedule_once(self.preload)
@@ -6,7 +6,15 @@ from kivy.uix.spinner import Spinner
 from kivy.uix.label import Label
 from kivy.metrics import dp
 from kivy.uix.widget import Widget
-import json
+# Only light modules here: the engine loads with the game screen, after the first frame
+from game.options import DIFFICULTY_LEVELS, DEFAULT_DIFFICULTY, PVP, PVC
+from game.level_repository import DEFAULT_LEVEL, LevelError, open_repository
+
+# Spinner text for each game mode
+GAME_MODES = {
+    'Player vs Player': PVP,
+    'Player vs Computer': PVC,
+}
 
 class StartScreen(Screen):
     def __init__(self, **kwargs):
@@ -33,19 +41,29 @@ class StartScreen(Screen):
             cols=2,
             spacing=dp(10),
             size_hint_y=None,
-            height=dp(200)
+            height=dp(250)
         )
 
         # Game mode selection
         content.add_widget(Label(text='Game Mode:'))
         self.mode_spinner = Spinner(
             text='Player vs Player',
-            values=['Player vs Player'],
+            values=list(GAME_MODES),
             size_hint_y=None,
             height=dp(40)
         )
         content.add_widget(self.mode_spinner)
 
+        # Computer difficulty selection
+        content.add_widget(Label(text='Difficulty:'))
+        self.difficulty_spinner = Spinner(
+            text=DEFAULT_DIFFICULTY,
+            values=list(DIFFICULTY_LEVELS),
+            size_hint_y=None,
+            height=dp(40)
+        )
+        content.add_widget(self.difficulty_spinner)
+
         # Time limit selection
         content.add_widget(Label(text='Time Limit:'))
         self.time_spinner = Spinner(
@@ -84,36 +102,20 @@ class StartScreen(Screen):
         self.add_widget(main_layout)
 
     def _load_level_names(self):
-        """Load level names from levels.txt"""
+        """Level names from the level repository"""
         try:
-            with open('levels.txt', 'r') as f:
-                levels = json.load(f)
-                return [level['name'] for level in levels]
-        except (FileNotFoundError, json.JSONDecodeError):
-            return ['Default Level']
+            return open_repository().names() or [DEFAULT_LEVEL['name']]
+        except (OSError, LevelError):
+            return [DEFAULT_LEVEL['name']]
 
     def _load_selected_level(self):
         """Load the selected level data"""
         try:
-            with open('levels.txt', 'r') as f:
-                levels = json.load(f)
-                return next(level for level in levels 
-                          if level['name'] == self.level_spinner.text)
-        except (FileNotFoundError, json.JSONDecodeError):
-            # Return a default level if file cannot be loaded
-            return {
-                'name': 'Default Level',
-                'size': [7, 7],
-                'board': [
-                    [1, 0, 0, 0, 0, 0, 2],
-                    [0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0],
-                    [2, 0, 0, 0, 0, 0, 1]
-                ]
-            }
+            level = open_repository().get(self.level_spinner.text)
+        except (OSError, LevelError):
+            level = None
+        # Fall back to a default level if the file cannot be loaded
+        return level or DEFAULT_LEVEL
 
     def start_game(self, instance):
         """Initialize and start a new game"""
@@ -128,7 +130,9 @@ class StartScreen(Screen):
         # Initialize game state
         game_screen = self.manager.get_screen('game')
         game_screen.reset_game()  # Reset before starting new game
-        game_screen.start_new_game(level_data, time_limit)
+        game_screen.start_new_game(level_data, time_limit,
+                                   GAME_MODES.get(self.mode_spinner.text, PVP),
+                                   self.difficulty_spinner.text)
         
         # Switch to game screen
         self.manager.current = 'game'
@@ -136,6 +140,7 @@ class StartScreen(Screen):
     def on_enter(self):
         """Reset selections when entering screen"""
         self.mode_spinner.text = 'Player vs Player'
+        self.difficulty_spinner.text = DEFAULT_DIFFICULTY
         self.time_spinner.text = 'Unlimited'
         if self.level_spinner.values:
             self.level_spinner.text = self.level_spinner.values[0]
\ No newline at end of file
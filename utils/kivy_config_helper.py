@@ -38,9 +38,9 @@ Returns a tuple of (window_width, window_height, density). This is either the wi
 or it is the [graphics] width and height from the existing config file.
 
 The density is a bit peculiar because if simulation mode is enabled then the device density cannot be queried
-accurately. Therefore, it relies on storing the correct density to the config during a previous run. Because of
-this, the script may occasionally exit and ask you to run again if a change in density was detected, or if the
-density has not yet been stored. There is an edge case were if you stay in simulation mode but change attached
+accurately. Therefore, it relies on storing the correct density to the config during a previous non-simulated run;
+until one has happened, simulation assumes a density of 1.0. The config file is only written when a value actually
+changes. There is an edge case were if you stay in simulation mode but change attached
 displays then the density could be incorrect. To fix, simply run without simulation mode on, then toggle it back.
 
 Example calls
@@ -130,13 +130,20 @@ if is_kivy_loaded():
 from kivy.config import Config
 
 
-def write_density():
+def set_config(section, option, value):
+    """Set a config value in memory; returns True if it changed"""
+    value = str(value)
+    if not Config.has_section(section):
+        Config.add_section(section)
+    elif Config.has_option(section, option) and Config.get(section, option) == value:
+        return False
+    Config.set(section, option, value)
+    return True
+
+
+def read_density():
     # critical that metrics is not loaded until other configuration is set to what we want (esp. window resolution)
     from kivy.metrics import Metrics
-    if not Config.has_section('simulation'):
-        Config.add_section('simulation')
-    Config.set('simulation', 'density', str(Metrics.dp))
-    Config.write()
     return Metrics.dp
 
 
@@ -149,14 +156,14 @@ def config_kivy(window_width=None, window_height=None,
 
     config_window_width = Config.getint('graphics', 'width')
     config_window_height = Config.getint('graphics', 'height')
+    changed = False
 
     if Config.has_section('simulation') and Config.has_option('simulation', 'density'):
         curr_device_density = Config.getfloat('simulation', 'density')
     else:
-        curr_device_density = write_density()
-        print(f"The current device density ({curr_device_density}) has been stored in the configuration")
-        print(f"Now exiting, please run again to use the stored configuration.")
-        exit(0)
+        # Only simulation needs the stored density; until a normal run has
+        # stored it, simulate as if the device density were 1.0
+        curr_device_density = 1.0
 
     if simulate_device:
         # Note the following simulation strategy assumes you want to simulate the same resolution
@@ -187,23 +194,20 @@ def config_kivy(window_width=None, window_height=None,
         print(f"target_window_width: {target_window_width}, target_window_height: {target_window_height}")
         print(f"config_window_width: {config_window_width}, config_window_height: {config_window_height}")
 
-        Config.set('graphics', 'width', str(target_window_width))
-        Config.set('graphics', 'height', str(target_window_height))
+        changed |= set_config('graphics', 'width', target_window_width)
+        changed |= set_config('graphics', 'height', target_window_height)
 
     if simulate_device:
         target_window_width = window_width
         target_window_height = window_height
         print(f"Simulated resolution: {target_window_width}x{target_window_height}")
     else:
-        # we can only get a reliable density if we aren't simulating (due to impact of KIVY_METRICS_DENSITY env var)
-        check_density = write_density()
+        # we can only get a reliable density if we aren't simulating (due to impact of KIVY_METRICS_DENSITY env var).
+        # It is stored for later simulated runs; this run does not need it, so there is no restart
+        changed |= set_config('simulation', 'density', read_density())
 
-        if curr_device_density != check_density:
-            print(f"The current device density ({check_density}) doesn't match the stored "
-                  f"configuration ({curr_device_density}).")
-            print(f"Therefore, updating the config to use the correct density.")
-            print(f"Now exiting, please run again to use the stored configuration.")
-            exit(0)
+    # Writing the config file costs a disk write on every launch, so only write real changes
+    if changed:
+        Config.write()
 
     return target_window_width, target_window_height
-
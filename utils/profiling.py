@@ -0,0 +1,146 @@
+"""Opt-in timing of UI and rules hot paths.
+
+Set ATAXX_PROFILE=1, or ``profile = 1`` under ``[ataxx]`` in the Kivy
+config, to turn it on. Functions wrapped with @profiled then record their
+call count, total time and worst time, and calls slower than SLOW_CALL_MS
+are kept in a short list of recent slow calls. install_overlay() adds an
+FPS, frame-time and slow-call overlay, toggled with F12. The aggregated
+stats are written to ATAXX_PROFILE_FILE (default profile_stats.json) on exit.
+
+Switch profiling on before importing the instrumented modules: when it is
+off, @profiled returns the function unchanged, so there is no overhead.
+"""
+import atexit
+import functools
+import json
+import os
+import time
+from collections import deque
+
+ENABLED = os.environ.get('ATAXX_PROFILE', '') not in ('', '0')
+STATS_PATH = os.environ.get('ATAXX_PROFILE_FILE', 'profile_stats.json')
+
+# Calls at least this slow are listed as slow calls
+SLOW_CALL_MS = 4.0
+SLOW_CALLS_KEPT = 20
+
+# Upper bounds, in ms, of the frame-time histogram buckets; the last is open-ended
+FRAME_BUCKETS_MS = (8.3, 16.7, 33.3, 50.0)
+OVERLAY_REFRESH = 0.5  # Seconds between overlay updates
+
+_calls = {}  # name -> [count, total seconds, worst seconds]
+_slow_calls = deque(maxlen=SLOW_CALLS_KEPT)  # (name, ms, time.monotonic() at the end)
+_frame_counts = [0] * (len(FRAME_BUCKETS_MS) + 1)
+_frame_times = deque(maxlen=120)  # Recent frame times in seconds, for FPS
+_dump_registered = False
+
+
+def enable():
+    """Turn profiling on; affects functions decorated after this call"""
+    global ENABLED, _dump_registered
+    ENABLED = True
+    if not _dump_registered:
+        atexit.register(dump)
+        _dump_registered = True
+
+
+def profiled(func=None, *, name=None):
+    """Decorator recording each call's duration under name (default: the qualified name)"""
+    if func is None:
+        return functools.partial(profiled, name=name)
+    if not ENABLED:
+        return func
+    key = name or func.__qualname__
+    stats = _calls.setdefault(key, [0, 0.0, 0.0])
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+            if elapsed * 1000 >= SLOW_CALL_MS:
+                _slow_calls.append((key, elapsed * 1000, time.monotonic()))
+    return wrapper
+
+
+def record_frame(dt: float):
+    """Count one frame of dt seconds"""
+    _frame_times.append(dt)
+    ms = dt * 1000
+    for i, bound in enumerate(FRAME_BUCKETS_MS):
+        if ms < bound:
+            _frame_counts[i] += 1
+            return
+    _frame_counts[-1] += 1
+
+
+def fps() -> float:
+    total = sum(_frame_times)
+    return len(_frame_times) / total if total else 0.0
+
+
+def frame_histogram() -> dict:
+    """Frame counts per bucket, labelled by upper bound in ms"""
+    labels = [f'<{bound:g}ms' for bound in FRAME_BUCKETS_MS] + [f'>={FRAME_BUCKETS_MS[-1]:g}ms']
+    return dict(zip(labels, _frame_counts))
+
+
+def summary() -> dict:
+    """Aggregated call stats, slowest total first, plus frame stats"""
+    calls = {name: {'calls': count, 'total_ms': round(total * 1000, 3),
+                    'mean_ms': round(total / count * 1000, 4) if count else None,
+                    'max_ms': round(worst * 1000, 3)}
+             for name, (count, total, worst) in sorted(_calls.items(), key=lambda item: -item[1][1])}
+    return {'calls': calls, 'frames': frame_histogram(), 'fps': round(fps(), 1),
+            'slow_calls': [{'name': name, 'ms': round(ms, 3)} for name, ms, _ in _slow_calls]}
+
+
+def dump(path: str = None):
+    """Write summary() as JSON"""
+    with open(path or STATS_PATH, 'w') as f:
+        json.dump(summary(), f, indent=2)
+
+
+def install_overlay(window):
+    """Count frames and add the stats overlay to a Kivy window; F12 shows or hides it"""
+    from kivy.clock import Clock
+    from kivy.uix.label import Label
+    from kivy.metrics import dp
+
+    overlay = Label(size_hint=(None, None), halign='left', valign='top', font_size=dp(11),
+                    color=(1, 1, 0, 1))
+    overlay.bind(texture_size=lambda label, size: setattr(label, 'size', size))
+    state = {'shown': False}
+
+    def refresh(dt):
+        if not state['shown']:
+            return
+        lines = [f'FPS {fps():.1f}', '  '.join(f'{k} {v}' for k, v in frame_histogram().items())]
+        lines += [f'{name} {ms:.1f}ms' for name, ms, _ in list(_slow_calls)[-5:]]
+        overlay.text = '\n'.join(lines)
+        overlay.pos = (dp(4), window.height - overlay.height - dp(4))
+
+    def on_key_down(_window, key, *args):
+        if key == 293:  # F12
+            state['shown'] = not state['shown']
+            if state['shown']:
+                window.add_widget(overlay)
+                refresh(0)
+            else:
+                window.remove_widget(overlay)
+            return True
+        return False
+
+    Clock.schedule_interval(record_frame, 0)
+    Clock.schedule_interval(refresh, OVERLAY_REFRESH)
+    window.bind(on_key_down=on_key_down)
+
+
+if ENABLED:
+    enable()